@@ -0,0 +1,65 @@
+"""pakgen — PAK archive build pipeline for Oxygen engine assets.
+
+Typical use::
+
+    from pakgen import build_plan, compute_pak_plan, load_spec, validate, write_pak
+
+    spec = load_spec("assets.yaml")
+    errors = validate(spec.raw)
+    if errors:
+        ...
+    build = build_plan(spec.raw, spec.base_dir)
+    plan = compute_pak_plan(build)
+    write_pak(build, plan, "out.pak")
+"""
+
+from .errors import PakGenError, PakWriteError, PlanError, SpecError
+from .packing.planner import (
+    BuildPlan,
+    PakPlan,
+    build_plan,
+    collect_assets,
+    collect_resources,
+    compute_pak_plan,
+    to_plan_dict,
+)
+from .packing.writer import write_pak
+from .reporting import (
+    JsonLinesReporter,
+    PlainReporter,
+    Reporter,
+    SilentReporter,
+    get_reporter,
+    section,
+    set_reporter,
+)
+from .spec.loader import PakSpec, load_spec
+from .spec.validation import ValidationErrorRecord, validate
+
+__all__ = [
+    "BuildPlan",
+    "JsonLinesReporter",
+    "PakGenError",
+    "PakPlan",
+    "PakSpec",
+    "PakWriteError",
+    "PlainReporter",
+    "PlanError",
+    "Reporter",
+    "SilentReporter",
+    "SpecError",
+    "ValidationErrorRecord",
+    "build_plan",
+    "collect_assets",
+    "collect_resources",
+    "compute_pak_plan",
+    "get_reporter",
+    "load_spec",
+    "section",
+    "set_reporter",
+    "to_plan_dict",
+    "validate",
+    "write_pak",
+]
+
+__version__ = "0.1.0"
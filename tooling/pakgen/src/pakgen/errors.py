@@ -0,0 +1,17 @@
+"""Exception hierarchy for pakgen."""
+
+
+class PakGenError(Exception):
+    """Base class for all pakgen errors."""
+
+
+class SpecError(PakGenError):
+    """Raised when a spec file cannot be loaded or is structurally invalid."""
+
+
+class PlanError(PakGenError):
+    """Raised when a PAK layout cannot be planned from the collected inputs."""
+
+
+class PakWriteError(PakGenError):
+    """Raised when the writer detects an inconsistency between plan and data."""
@@ -0,0 +1,13 @@
+"""PAK layout planning and writing."""
+
+from .planner import BuildPlan, PakPlan, build_plan, compute_pak_plan, to_plan_dict
+from .writer import write_pak
+
+__all__ = [
+    "BuildPlan",
+    "PakPlan",
+    "build_plan",
+    "compute_pak_plan",
+    "to_plan_dict",
+    "write_pak",
+]
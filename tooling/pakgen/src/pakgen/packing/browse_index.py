@@ -0,0 +1,54 @@
+"""Browse-index payload construction.
+
+The browse index is a small table at the end of the PAK mapping asset
+keys to human-readable virtual paths, so editor tooling can list pak
+contents without touching asset descriptors.
+"""
+
+from __future__ import annotations
+
+import struct
+from dataclasses import dataclass
+from typing import List, Sequence
+
+
+@dataclass(slots=True)
+class BrowseIndexEntrySpec:
+    asset_key: bytes
+    virtual_path: str
+
+
+def derive_virtual_path_from_asset_name(name: str) -> str:
+    """Map an asset name like ``env.rocks.boulder`` to a browse path."""
+    return "assets/" + name.replace(".", "/")
+
+
+def build_browse_index_payload(entries: List[BrowseIndexEntrySpec]) -> bytes:
+    """Serialize *entries*: a count followed by (key, path-length, path) records."""
+    parts = [struct.pack("<I", len(entries))]
+    for entry in entries:
+        vpath = entry.virtual_path.encode("utf-8")
+        parts.append(struct.pack("<16sH", entry.asset_key, len(vpath)))
+        parts.append(vpath)
+    return b"".join(parts)
+
+
+_ENTRY_HEAD = struct.Struct("<16sH")
+
+
+def build_browse_index_payload_for_assets(assets: Sequence) -> bytes:
+    """Serialize the browse index straight from planned assets.
+
+    Iterates the plan once, without materializing an intermediate
+    :class:`BrowseIndexEntrySpec` list; *assets* needs the ``key_bytes``
+    and ``virtual_path`` fields precomputed by the planner on
+    :class:`~pakgen.packing.planner.AssetPlan`.
+    """
+    parts = [struct.pack("<I", len(assets))]
+    append = parts.append
+    pack_head = _ENTRY_HEAD.pack
+    for a in assets:
+        vpath = a.virtual_path.encode("utf-8")
+        append(pack_head(a.key_bytes, len(vpath)))
+        append(vpath)
+    return b"".join(parts)
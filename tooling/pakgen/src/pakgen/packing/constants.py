@@ -0,0 +1,108 @@
+"""Binary layout constants for the PAK container format.
+
+All sizes are in bytes.  The on-disk layout is:
+
+    [header][resource data regions][resource tables]
+    [asset descriptors][directory][browse index][footer]
+
+Every section is aligned; padding between sections is zero-filled and
+accounted for in :class:`~pakgen.packing.planner.PaddingStats`.
+"""
+
+import enum
+
+PAK_MAGIC = b"OXPAK\x00"
+PAK_FOOTER_MAGIC = b"OXPAKEND"
+PAK_VERSION = 1
+
+HEADER_SIZE = 64
+FOOTER_SIZE = 64
+# Offset of the CRC-32 field inside the footer.
+FOOTER_CRC_OFFSET = 48
+
+DATA_ALIGNMENT = 256
+TABLE_ALIGNMENT = 64
+DIRECTORY_ALIGNMENT = 64
+
+# Blob and section packing rely on bitmask arithmetic for alignment.
+assert DATA_ALIGNMENT & (DATA_ALIGNMENT - 1) == 0
+assert TABLE_ALIGNMENT & (TABLE_ALIGNMENT - 1) == 0
+assert DIRECTORY_ALIGNMENT & (DIRECTORY_ALIGNMENT - 1) == 0
+
+# Fixed-size portion of every asset descriptor (type, name, version,
+# streaming priority, content hash, variant flags, reserved).
+ASSET_HEADER_SIZE = 95
+MATERIAL_DESC_SIZE = 256
+GEOMETRY_DESC_SIZE = 256
+MESH_DESC_SIZE = 112
+SUBMESH_DESC_SIZE = 108
+MESH_VIEW_DESC_SIZE = 16
+SHADER_REF_SIZE = 32
+DIRECTORY_ENTRY_SIZE = 40
+
+BUFFER_DESC_SIZE = 32
+TEXTURE_DESC_SIZE = 40
+AUDIO_DESC_SIZE = 32
+
+ASSET_KEY_SIZE = 16
+ASSET_NAME_MAX_LENGTH = 63
+
+MAX_RESOURCES_PER_TYPE = 65_535
+MAX_ASSETS_TOTAL = 1_000_000
+MAX_TEXTURE_DIMENSION = 16_384
+MAX_BUFFER_STRIDE = 4_096
+MAX_INDEX_COUNT = 100_000_000
+MAX_VERTEX_COUNT = 100_000_000
+MAX_GENERATED_NODES = 1_000_000
+
+class ResourceType(enum.IntEnum):
+    """Resource kinds, in region/table emission order.
+
+    The values index the structure-of-arrays fields of
+    ``ResourceCollectionResult`` directly.
+    """
+
+    TEXTURE = 0
+    BUFFER = 1
+    AUDIO = 2
+
+    @property
+    def key(self) -> str:
+        """Lowercase name used in plan sections, task ids and messages."""
+        return self.name.lower()
+
+
+# Lowercase names in emission order, for plan/table naming.
+RESOURCE_TYPES = tuple(rt.key for rt in ResourceType)
+
+# Asset type tag as stored in directory entries; 0 is reserved for
+# "unknown" so readers can skip entries written by newer tools.
+ASSET_TYPE_MAP = {
+    "material": 1,
+    "geometry": 2,
+    "scene": 3,
+}
+
+TEXTURE_FORMAT_MAP = {
+    "rgba8": 1,
+    "bc7": 2,
+    "bc5": 3,
+    "rgba16f": 4,
+}
+
+BUFFER_USAGE_MAP = {
+    "static": 0,
+    "dynamic": 1,
+    "index": 2,
+    "vertex": 3,
+}
+
+AUDIO_CODEC_MAP = {
+    "pcm": 0,
+    "vorbis": 1,
+    "opus": 2,
+}
+
+VALID_MESH_TYPES = frozenset({"standard", "skinned", "procedural"})
+
+VALID_LAYOUTS = frozenset({"grid", "linear", "circle", "scatter"})
@@ -0,0 +1,730 @@
+"""PAK layout planning.
+
+The planner turns a validated spec into an exact byte-level layout:
+
+* ``collect_resources`` / ``collect_assets`` gather payloads and asset
+  entries from the raw spec dict,
+* ``build_plan`` bundles both into a :class:`BuildPlan`,
+* ``compute_pak_plan`` assigns every section its final offset and size,
+  producing a :class:`PakPlan` the writer replays verbatim,
+* ``to_plan_dict`` renders a plan as plain data for manifests and diffs.
+
+Planning is deterministic by default: resources and assets are ordered
+by name so identical specs produce byte-identical PAKs.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import operator
+import sys
+import zlib
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from ..errors import PlanError
+from ..reporting import Reporter, get_reporter
+from ..utils.io import read_data_from_spec, read_size_from_spec
+from .browse_index import derive_virtual_path_from_asset_name
+from .constants import (
+    ASSET_KEY_SIZE,
+    ASSET_NAME_MAX_LENGTH,
+    AUDIO_DESC_SIZE,
+    BUFFER_DESC_SIZE,
+    DATA_ALIGNMENT,
+    DIRECTORY_ALIGNMENT,
+    DIRECTORY_ENTRY_SIZE,
+    FOOTER_SIZE,
+    GEOMETRY_DESC_SIZE,
+    HEADER_SIZE,
+    MATERIAL_DESC_SIZE,
+    MAX_ASSETS_TOTAL,
+    MAX_RESOURCES_PER_TYPE,
+    MESH_DESC_SIZE,
+    MESH_VIEW_DESC_SIZE,
+    RESOURCE_TYPES,
+    SHADER_REF_SIZE,
+    SUBMESH_DESC_SIZE,
+    TABLE_ALIGNMENT,
+    TEXTURE_DESC_SIZE,
+    ResourceType,
+)
+
+
+class SizedBlob(NamedTuple):
+    """Placeholder for a resource payload when only its size is known.
+
+    ``len()`` reports the payload size, so size-only collections flow
+    through the layout arithmetic unchanged; the originating spec entry
+    rides along so a writer can materialize the bytes later.
+    """
+
+    size: int
+    spec: Dict[str, Any]
+
+    def __len__(self) -> int:
+        return self.size
+
+
+@dataclass(slots=True)
+class ResourceCollectionResult:
+    """Collected resource payloads and descriptor fields, per type.
+
+    The three parallel fields are structure-of-arrays lists indexed by
+    :class:`~pakgen.packing.constants.ResourceType`, so per-type access
+    is an array index instead of a string-keyed dict probe.
+    """
+
+    data_blobs: List[List[Any]]
+    desc_fields: List[List[Dict[str, Any]]]
+    index_map: List[Dict[str, int]]
+    total_bytes: int = 0
+
+    @property
+    def by_name(self) -> Dict[str, Tuple[List[Any], List[Dict[str, Any]], Dict[str, int]]]:
+        """Name-keyed view of the per-type arrays, for convenience callers."""
+        return {
+            rt.key: (self.data_blobs[rt], self.desc_fields[rt], self.index_map[rt])
+            for rt in ResourceType
+        }
+
+
+@dataclass(slots=True)
+class AssetCollectionResult:
+    """Collected material/geometry asset entries, in spec order.
+
+    ``geometry_name_to_key`` and ``simple_material_names`` are derived
+    once here so the writer's hot path reads them instead of rebuilding
+    them per write_pak call.
+    """
+
+    material_assets: List[Dict[str, Any]]
+    geometry_assets: List[Dict[str, Any]]
+    material_count: int
+    geometry_count: int
+    scene_count: int = 0
+    geometry_name_to_key: Dict[str, bytes] = field(default_factory=dict)
+    simple_material_names: set = field(default_factory=set)
+
+
+@dataclass(slots=True)
+class BuildPlan:
+    """Everything the layout planner and writer need about one build."""
+
+    spec: Dict[str, Any]
+    base_dir: Path
+    content_version: int
+    resources: ResourceCollectionResult
+    assets: AssetCollectionResult
+
+
+@dataclass(slots=True, frozen=True)
+class RegionPlan:
+    name: str
+    offset: int
+    size: int
+    alignment: int
+    padding_before: int
+    padding_after: int
+
+
+@dataclass(slots=True, frozen=True)
+class TablePlan:
+    name: str
+    offset: int
+    size: int
+    entry_count: int
+    entry_size: int
+
+
+@dataclass(slots=True, frozen=True)
+class AssetPlan:
+    asset_type: str
+    name: str
+    key_hex: str
+    descriptor_offset: int
+    descriptor_size: int
+    variable_extra_size: int
+    alignment: int
+    content_hash: int
+    # Decoded/derived once at plan time so the write path never re-does
+    # hex decoding or virtual-path derivation.
+    key_bytes: bytes = b""
+    virtual_path: str = ""
+
+
+@dataclass(slots=True, frozen=True)
+class DirectoryPlan:
+    offset: int
+    size: int
+    entry_count: int
+
+
+@dataclass(slots=True, frozen=True)
+class FooterPlan:
+    offset: int
+    size: int
+
+
+@dataclass(slots=True, frozen=True)
+class PaddingStats:
+    by_label: Dict[str, int] = field(default_factory=dict)
+    total: int = 0
+
+
+@dataclass(slots=True)
+class PakPlan:
+    """Complete byte-level layout of one PAK file."""
+
+    regions: List[RegionPlan]
+    tables: List[TablePlan]
+    assets: List[AssetPlan]
+    directory: DirectoryPlan
+    footer: FooterPlan
+    file_size: int
+    padding: PaddingStats
+    content_version: int
+
+
+def collect_resources(
+    spec: Dict[str, Any],
+    base_dir: Path,
+    *,
+    size_only: bool = False,
+    rep: Optional[Reporter] = None,
+) -> ResourceCollectionResult:
+    """Read every resource payload referenced by *spec*.
+
+    With ``size_only=True`` (plan-only runs), payloads are stat'ed
+    instead of read and ``data_blobs`` holds :class:`SizedBlob`
+    placeholders rather than bytes, keeping memory at O(blob count)
+    instead of O(total bytes).
+    """
+    rep = rep if rep is not None else get_reporter()
+    section_for_type = ("textures", "buffers", "audios")
+    data_blobs: List[List[Any]] = [[] for _ in ResourceType]
+    desc_fields: List[List[Dict[str, Any]]] = [[] for _ in ResourceType]
+    index_map: List[Dict[str, int]] = [{} for _ in ResourceType]
+    # Dedicated dedup sets keep membership checks off the growing index
+    # dicts, which double as the (ordered) name->index output.
+    seen: List[set] = [set() for _ in ResourceType]
+    total_bytes = 0
+    for rt in ResourceType:
+        rtype = rt.key
+        entries = spec.get(section_for_type[rt]) or []
+        if len(entries) > MAX_RESOURCES_PER_TYPE:
+            raise PlanError(f"too many {rtype} resources: {len(entries)}")
+        task_key = f"res.{rtype}"
+        rep.start_task(task_key, f"Collect {rtype} resources", total=len(entries))
+        blobs = data_blobs[rt]
+        descs = desc_fields[rt]
+        indices = index_map[rt]
+        seen_names = seen[rt]
+        # Batch progress updates so reporter overhead stays amortized on
+        # large resource sections (~100 updates per task).
+        batch = max(1, len(entries) // 100)
+        pending = 0
+        for entry in entries:
+            if not isinstance(entry, dict):
+                continue
+            name = entry.get("name")
+            if not isinstance(name, str) or not name:
+                raise PlanError(f"{rtype} resource without a name")
+            if name in seen_names:
+                raise PlanError(f"duplicate {rtype} resource name {name!r}")
+            seen_names.add(name)
+            if size_only:
+                try:
+                    size = read_size_from_spec(entry, base_dir)
+                except (OSError, ValueError) as exc:
+                    rep.error(f"cannot stat {rtype} resource {name!r}: {exc}")
+                    size = 0
+                data: Any = SizedBlob(size, entry)
+            else:
+                try:
+                    data = read_data_from_spec(entry, base_dir)
+                except (OSError, ValueError) as exc:
+                    rep.error(f"cannot read {rtype} resource {name!r}: {exc}")
+                    data = b""
+                size = len(data)
+            indices[name] = len(blobs)
+            blobs.append(data)
+            descs.append(entry)
+            total_bytes += size
+            pending += 1
+            if pending >= batch:
+                rep.advance(task_key, step=pending, current_item=name)
+                pending = 0
+        if pending:
+            rep.advance(task_key, step=pending)
+        rep.end_task(task_key)
+    rep.status(
+        f"resources summary: "
+        f"{sum(len(v) for v in data_blobs)} blobs, {total_bytes} bytes"
+    )
+    return ResourceCollectionResult(data_blobs, desc_fields, index_map, total_bytes)
+
+
+def _validate_geometry_structure(spec: Dict[str, Any], name: str) -> None:
+    """Reject malformed geometry nesting once, at collection time.
+
+    Planning and writing then walk lods/submeshes/mesh_views without
+    per-element isinstance guards.
+    """
+    lods = spec.get("lods")
+    if lods is None:
+        return
+    if not isinstance(lods, list):
+        raise PlanError(f"geometry {name!r}: lods must be a list")
+    for lod in lods:
+        if not isinstance(lod, dict):
+            raise PlanError(f"geometry {name!r}: lod entries must be mappings")
+        submeshes = lod.get("submeshes")
+        if submeshes is None:
+            continue
+        if not isinstance(submeshes, list):
+            raise PlanError(f"geometry {name!r}: submeshes must be a list")
+        for sub in submeshes:
+            if not isinstance(sub, dict):
+                raise PlanError(f"geometry {name!r}: submesh entries must be mappings")
+            mesh_views = sub.get("mesh_views")
+            if mesh_views is None:
+                continue
+            if not isinstance(mesh_views, list):
+                raise PlanError(f"geometry {name!r}: mesh_views must be a list")
+            for mv in mesh_views:
+                if not isinstance(mv, dict):
+                    raise PlanError(
+                        f"geometry {name!r}: mesh_view entries must be mappings"
+                    )
+
+
+# Strips separators and whitespace from asset keys in one C pass.
+_KEY_STRIP = str.maketrans("", "", "-\t\n\r ")
+
+
+def _collect_asset_entry(entry: Dict[str, Any], asset_type: str) -> Dict[str, Any]:
+    """Normalize one material/geometry asset entry for planning."""
+    name = entry.get("name")
+    if not isinstance(name, str) or not name:
+        raise PlanError(f"{asset_type} asset without a name")
+    if len(name.encode("utf-8")) > ASSET_NAME_MAX_LENGTH:
+        raise PlanError(f"asset name too long: {name!r}")
+    raw_key = entry.get("asset_key")
+    key_hex = ""
+    if isinstance(raw_key, str):
+        try:
+            key_bytes = bytes.fromhex(raw_key.translate(_KEY_STRIP))
+        except ValueError:
+            key_bytes = b""
+        if len(key_bytes) == ASSET_KEY_SIZE:
+            key_hex = key_bytes.hex()
+    if not key_hex:
+        # Stable fallback key derived from the asset identity.
+        key_hex = hashlib.md5(
+            f"{asset_type}:{name}".encode("utf-8"), usedforsecurity=False
+        ).hexdigest()
+    alignment = int(entry.get("alignment", 16) or 16)
+    if alignment <= 0 or alignment & (alignment - 1):
+        raise PlanError(f"asset alignment must be a power of two: {alignment}")
+    spec_val = entry.get("spec")
+    spec_dict = dict(spec_val) if isinstance(spec_val, dict) else {}
+    # The entry-level name is canonical; planning and writing key off the
+    # copy in the spec dict, so any stray inner "name" must not win.
+    spec_dict["name"] = name
+    if asset_type == "geometry":
+        _validate_geometry_structure(spec_dict, name)
+    return {
+        "type": asset_type,
+        "name": name,
+        "key_hex": key_hex,
+        "alignment": alignment,
+        "spec": spec_dict,
+    }
+
+
+def collect_assets(
+    spec: Dict[str, Any], *, rep: Optional[Reporter] = None
+) -> AssetCollectionResult:
+    """Partition the spec's asset entries into materials and geometries."""
+    rep = rep if rep is not None else get_reporter()
+    assets_list = spec.get("assets") or []
+    if len(assets_list) > MAX_ASSETS_TOTAL:
+        raise PlanError(f"too many assets: {len(assets_list)}")
+    materials: List[Dict[str, Any]] = []
+    geometries: List[Dict[str, Any]] = []
+    scene_count = 0
+    rep.start_task("collect.assets", "Collect assets", total=None)
+    batch = max(1, len(assets_list) // 100)
+    pending = 0
+    for entry in assets_list:
+        if not isinstance(entry, dict):
+            continue
+        t = entry.get("type")
+        if t == "material":
+            materials.append(_collect_asset_entry(entry, t))
+        elif t == "geometry":
+            geometries.append(_collect_asset_entry(entry, t))
+        elif t == "scene":
+            scene_count += 1
+            continue
+        else:
+            continue
+        pending += 1
+        if pending >= batch:
+            rep.advance("collect.assets", step=pending, current_item=entry.get("name"))
+            pending = 0
+    if pending:
+        rep.advance("collect.assets", step=pending)
+    rep.end_task("collect.assets")
+    rep.status(
+        f"assets summary: {len(materials)} materials, {len(geometries)} geometries, "
+        f"{scene_count} scenes"
+    )
+    return AssetCollectionResult(
+        material_assets=materials,
+        geometry_assets=geometries,
+        material_count=len(materials),
+        geometry_count=len(geometries),
+        scene_count=scene_count,
+        geometry_name_to_key={g["name"]: bytes.fromhex(g["key_hex"]) for g in geometries},
+        simple_material_names={
+            m["name"] for m in materials if not m["spec"].get("shader_stages")
+        },
+    )
+
+
+def build_plan(
+    spec: Dict[str, Any],
+    base_dir: Path,
+    *,
+    size_only: bool = False,
+    rep: Optional[Reporter] = None,
+) -> BuildPlan:
+    """Collect resources and assets from *spec* into a :class:`BuildPlan`.
+
+    ``size_only`` propagates to :func:`collect_resources`; the resulting
+    build can be planned but not written.
+    """
+    rep = rep if rep is not None else get_reporter()
+    resources = collect_resources(spec, base_dir, size_only=size_only, rep=rep)
+    assets = collect_assets(spec, rep=rep)
+    return BuildPlan(
+        spec=spec,
+        base_dir=base_dir,
+        content_version=int(spec.get("content_version", 0)),
+        resources=resources,
+        assets=assets,
+    )
+
+
+def _material_extra_size(spec: Dict[str, Any]) -> int:
+    """Size of a material's shader-reference blocks."""
+    return int(spec.get("shader_stages", 0)).bit_count() * SHADER_REF_SIZE
+
+
+def _geometry_extra_size(spec: Dict[str, Any]) -> int:
+    """Size of a geometry's LOD/submesh/mesh-view blob.
+
+    Structure was validated at collection time, so the nesting is walked
+    without per-element isinstance guards.
+    """
+    return sum(
+        MESH_DESC_SIZE
+        + sum(
+            SUBMESH_DESC_SIZE + len(s.get("mesh_views") or ()) * MESH_VIEW_DESC_SIZE
+            for s in (l.get("submeshes") or ())
+        )
+        for l in (spec.get("lods") or ())
+    )
+
+
+# Plans keyed by build digest, for dry-run sweeps and fuzz loops that
+# re-plan unchanged builds.  Bounded; insertion order approximates LRU.
+_PLAN_CACHE: Dict[bytes, PakPlan] = {}
+_PLAN_CACHE_MAX = 64
+
+
+def _build_digest(build: BuildPlan, deterministic: bool) -> bytes:
+    """Digest of everything that influences the computed layout."""
+    h = hashlib.blake2b(digest_size=16)
+    h.update(b"deterministic" if deterministic else b"as-is")
+    h.update(str(build.content_version).encode("ascii"))
+    resources = build.resources
+    for rt in ResourceType:
+        blobs = resources.data_blobs[rt]
+        for desc, blob in zip(resources.desc_fields[rt], blobs):
+            h.update(f"{rt}:{desc.get('name', '')}:{len(blob)};".encode("utf-8"))
+    for entry in build.assets.material_assets:
+        spec = entry.get("spec") or {}
+        h.update(
+            f"m:{entry.get('name')}:{entry.get('key_hex')}:"
+            f"{_material_extra_size(spec)};".encode("utf-8")
+        )
+    for entry in build.assets.geometry_assets:
+        spec = entry.get("spec") or {}
+        h.update(
+            f"g:{entry.get('name')}:{entry.get('key_hex')}:"
+            f"{entry.get('alignment')}:{_geometry_extra_size(spec)};".encode("utf-8")
+        )
+    return h.digest()
+
+
+def compute_pak_plan(
+    build: BuildPlan, *, deterministic: bool = True, rep: Optional[Reporter] = None
+) -> PakPlan:
+    """Assign final offsets and sizes to every section of the PAK.
+
+    Repeated calls for an unchanged build return a cached plan; treat
+    returned plans as read-only.
+    """
+    rep = rep if rep is not None else get_reporter()
+    resources = build.resources
+    materials = build.assets.material_assets
+    geometries = build.assets.geometry_assets
+
+    padding_by_label: Dict[str, int] = {}
+
+    def align(value: int, alignment: int, label: str) -> Tuple[int, int]:
+        # All section alignments are powers of two, so a single AND
+        # replaces the double modulo.
+        mask = alignment - 1
+        assert alignment & mask == 0, f"alignment {alignment} not a power of two"
+        pad = (-value) & mask
+        if pad:
+            padding_by_label[label] = padding_by_label.get(label, 0) + pad
+        return value + pad, pad
+
+    if deterministic:
+        for rt in ResourceType:
+            descs = resources.desc_fields[rt]
+            blobs = resources.data_blobs[rt]
+            # Sort a permutation of indices and reindex both arrays:
+            # no per-element pair tuples and no zip(*...) re-unpack.
+            # Precomputing the names makes the key a C-level list index
+            # instead of a lambda with a dict probe per comparison.
+            names = [d.get("name", "") for d in descs]
+            order = sorted(range(len(descs)), key=names.__getitem__)
+            descs = [descs[i] for i in order]
+            resources.desc_fields[rt] = descs
+            resources.data_blobs[rt] = [blobs[i] for i in order]
+            resources.index_map[rt] = {
+                d.get("name", ""): i for i, d in enumerate(descs)
+            }
+        # Decorate-sort-undecorate with (name, spec index, entry) tuples:
+        # no key-function dispatch per element, and the unique index
+        # tiebreaker both pins equal names to spec order and keeps the
+        # sort from ever comparing the trailing dicts.
+        keyed_m = [
+            (m.get("spec", {}).get("name", "") if isinstance(m, dict) else "", i, m)
+            for i, m in enumerate(materials)
+        ]
+        keyed_m.sort()
+        materials = [t[2] for t in keyed_m]
+        keyed_g = [
+            (g.get("spec", {}).get("name", "") if isinstance(g, dict) else "", i, g)
+            for i, g in enumerate(geometries)
+        ]
+        keyed_g.sort()
+        geometries = [t[2] for t in keyed_g]
+        build.assets.material_assets = materials
+        build.assets.geometry_assets = geometries
+
+    # The deterministic normalization above must run even on a cache hit
+    # so the build's resource/asset order always matches the plan.
+    digest = _build_digest(build, deterministic)
+    cached = _PLAN_CACHE.get(digest)
+    if cached is not None:
+        rep.verbose("plan cache hit")
+        return cached
+
+    cursor = HEADER_SIZE
+
+    # Resource data regions.
+    regions: List[RegionPlan] = []
+    for rt in ResourceType:
+        rtype = rt.key
+        blobs = resources.data_blobs[rt]
+        offset, pad_before = align(cursor, DATA_ALIGNMENT, f"region.{rtype}")
+        # Every blob except the last is rounded up to the alignment; the
+        # region ends at the last blob's tail, with no trailing padding.
+        sizes = [len(blob) for blob in blobs]
+        if sizes:
+            mask = DATA_ALIGNMENT - 1
+            size = sum((s + mask) & ~mask for s in sizes[:-1]) + sizes[-1]
+        else:
+            size = 0
+        regions.append(
+            RegionPlan(
+                name=rtype,
+                offset=offset,
+                size=size,
+                alignment=DATA_ALIGNMENT,
+                padding_before=pad_before,
+                padding_after=0,
+            )
+        )
+        cursor = offset + size
+
+    # Resource descriptor tables.
+    entry_size_for_type = (TEXTURE_DESC_SIZE, BUFFER_DESC_SIZE, AUDIO_DESC_SIZE)
+    tables: List[TablePlan] = []
+    for rt in ResourceType:
+        rtype = rt.key
+        count = len(resources.desc_fields[rt])
+        offset, _ = align(cursor, TABLE_ALIGNMENT, f"table.{rtype}")
+        entry_size = entry_size_for_type[rt]
+        size = count * entry_size
+        tables.append(
+            TablePlan(
+                name=rtype, offset=offset, size=size, entry_count=count, entry_size=entry_size
+            )
+        )
+        cursor = offset + size
+
+    # Asset descriptors: materials first, then geometries, laid out by
+    # one fused loop over (tag, entry, desc size, alignment, extra fn).
+    typed = [
+        ("material", m, MATERIAL_DESC_SIZE, 16, _material_extra_size)
+        for m in materials
+    ]
+    typed += [
+        (
+            "geometry",
+            g,
+            GEOMETRY_DESC_SIZE,
+            (g.get("alignment", 16) or 16) if isinstance(g, dict) else 16,
+            _geometry_extra_size,
+        )
+        for g in geometries
+    ]
+    assets: List[AssetPlan] = []
+    rep.start_task("plan.assets", "Plan asset layout", total=len(typed))
+    for tag, entry, desc_size, alignment, extra_fn in typed:
+        spec = entry["spec"] if isinstance(entry, dict) else {}
+        if not isinstance(spec, dict):
+            spec = {}
+        name = spec.get("name", "")
+        key_hex = entry.get("key_hex", "") if isinstance(entry, dict) else ""
+        variable_extra = extra_fn(spec)
+        offset, _ = align(cursor, alignment, "assets")
+        assets.append(
+            AssetPlan(
+                asset_type=sys.intern(tag),
+                name=name,
+                key_hex=key_hex,
+                descriptor_offset=offset,
+                descriptor_size=desc_size,
+                variable_extra_size=variable_extra,
+                alignment=alignment,
+                content_hash=zlib.crc32(f"{name}:{key_hex}".encode("utf-8")),
+                key_bytes=bytes.fromhex(key_hex),
+                virtual_path=derive_virtual_path_from_asset_name(name),
+            )
+        )
+        cursor = offset + desc_size + variable_extra
+        rep.advance("plan.assets", current_item=name)
+    rep.end_task("plan.assets")
+
+    # Directory.
+    dir_offset, _ = align(cursor, DIRECTORY_ALIGNMENT, "directory")
+    directory = DirectoryPlan(
+        offset=dir_offset,
+        size=len(assets) * DIRECTORY_ENTRY_SIZE,
+        entry_count=len(assets),
+    )
+    cursor = dir_offset + directory.size
+
+    # Browse index.
+    browse_offset, _ = align(cursor, TABLE_ALIGNMENT, "browse_index")
+    browse_size = 4
+    for a in assets:
+        browse_size += 16 + 2 + len(a.virtual_path.encode("utf-8"))
+    tables.append(
+        TablePlan(
+            name="browse_index",
+            offset=browse_offset,
+            size=browse_size,
+            entry_count=len(assets),
+            entry_size=0,
+        )
+    )
+    cursor = browse_offset + browse_size
+
+    footer = FooterPlan(offset=cursor, size=FOOTER_SIZE)
+    file_size = cursor + FOOTER_SIZE
+    padding = PaddingStats(
+        by_label=padding_by_label, total=sum(padding_by_label.values())
+    )
+
+    rep.status(
+        f"plan summary: {len(assets)} assets, {file_size} bytes, "
+        f"{padding.total} padding"
+    )
+    plan = PakPlan(
+        regions=regions,
+        tables=tables,
+        assets=assets,
+        directory=directory,
+        footer=footer,
+        file_size=file_size,
+        padding=padding,
+        content_version=build.content_version,
+    )
+    if len(_PLAN_CACHE) >= _PLAN_CACHE_MAX:
+        _PLAN_CACHE.pop(next(iter(_PLAN_CACHE)))
+    _PLAN_CACHE[digest] = plan
+    return plan
+
+
+# Field tuples + attrgetters push to_plan_dict's per-record field
+# extraction into a single C-level slot read per plan object.
+_REGION_FIELDS = ("name", "offset", "size", "alignment", "padding_before", "padding_after")
+_region_get = operator.attrgetter(*_REGION_FIELDS)
+_TABLE_FIELDS = ("name", "offset", "size", "entry_count", "entry_size")
+_table_get = operator.attrgetter(*_TABLE_FIELDS)
+_ASSET_FIELDS = (
+    "asset_type",
+    "name",
+    "key_hex",
+    "descriptor_offset",
+    "descriptor_size",
+    "variable_extra_size",
+    "alignment",
+)
+_asset_get = operator.attrgetter(*_ASSET_FIELDS)
+
+
+def _plan_statistics(plan: PakPlan) -> Dict[str, Any]:
+    """Aggregate per-asset statistics in a single pass over the plan."""
+    mat = geo = extra = 0
+    for a in plan.assets:
+        extra += a.variable_extra_size
+        t = a.asset_type
+        mat += t == "material"
+        geo += t == "geometry"
+    return {
+        "asset_counts": {"material": mat, "geometry": geo},
+        "variable_extra_total": extra,
+        "padding_total": plan.padding.total,
+        "padding_by_label": dict(plan.padding.by_label),
+    }
+
+
+def to_plan_dict(plan: PakPlan) -> Dict[str, Any]:
+    """Render *plan* as plain data, for manifests, logging and plan diffs."""
+    return {
+        "file_size": plan.file_size,
+        "content_version": plan.content_version,
+        "regions": [dict(zip(_REGION_FIELDS, _region_get(r))) for r in plan.regions],
+        "tables": [dict(zip(_TABLE_FIELDS, _table_get(t))) for t in plan.tables],
+        "assets": [dict(zip(_ASSET_FIELDS, _asset_get(a))) for a in plan.assets],
+        "directory": {
+            "offset": plan.directory.offset,
+            "size": plan.directory.size,
+            "entry_count": plan.directory.entry_count,
+        },
+        "footer": {"offset": plan.footer.offset, "size": plan.footer.size},
+        "statistics": _plan_statistics(plan),
+    }
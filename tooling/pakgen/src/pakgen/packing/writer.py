@@ -0,0 +1,770 @@
+"""PAK file writing.
+
+The writer replays a :class:`~pakgen.packing.planner.PakPlan` byte for
+byte: every section is written at exactly its planned offset, with
+zero-filled padding in between, and any divergence between plan and
+collected data raises :class:`~pakgen.errors.PakWriteError`.  The file
+CRC is patched into the footer as a final pass.
+"""
+
+from __future__ import annotations
+
+import mmap
+import struct
+import zlib
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+from ..errors import PakWriteError
+from ..reporting import Reporter, get_reporter, section
+from .browse_index import build_browse_index_payload_for_assets
+from .constants import (
+    ASSET_HEADER_SIZE,
+    ASSET_TYPE_MAP,
+    AUDIO_CODEC_MAP,
+    BUFFER_USAGE_MAP,
+    DATA_ALIGNMENT,
+    DIRECTORY_ENTRY_SIZE,
+    FOOTER_CRC_OFFSET,
+    FOOTER_SIZE,
+    GEOMETRY_DESC_SIZE,
+    HEADER_SIZE,
+    MATERIAL_DESC_SIZE,
+    MESH_DESC_SIZE,
+    MESH_VIEW_DESC_SIZE,
+    PAK_FOOTER_MAGIC,
+    PAK_MAGIC,
+    PAK_VERSION,
+    SHADER_REF_SIZE,
+    SUBMESH_DESC_SIZE,
+    TEXTURE_FORMAT_MAP,
+    VALID_MESH_TYPES,
+    ResourceType,
+)
+from .planner import AssetPlan, BuildPlan, PakPlan
+
+
+# Shared zero buffer for padding writes; sections and blobs never need
+# more than one alignment's worth of fill at a time, larger pads slice
+# it repeatedly.
+_ZERO_PAD = bytes(DATA_ALIGNMENT)
+
+
+def _pad_to(f, target_offset: int) -> None:
+    """Advance the write position to *target_offset*, zero-filling the gap.
+
+    Small gaps are cheaper to write from the shared zero buffer; large
+    inter-section gaps just seek, letting the kernel materialize the
+    hole (sparse where the filesystem supports it, zero-filled
+    otherwise) with no user-space buffer churn.
+    """
+    pos = f.tell()
+    pad = target_offset - pos
+    if pad < 0:
+        raise PakWriteError(f"write cursor {pos} is beyond planned offset {target_offset}")
+    if pad >= 4096:
+        f.seek(target_offset)
+        return
+    mv = memoryview(_ZERO_PAD)
+    while pad > 0:
+        n = min(pad, DATA_ALIGNMENT)
+        f.write(mv[:n])
+        pad -= n
+
+
+# Asset descriptor header: type, name, version, streaming priority,
+# content hash, variant flags, 16 reserved bytes.
+_HEADER_STRUCT = struct.Struct("<B64sBBQI16s")
+assert _HEADER_STRUCT.size == ASSET_HEADER_SIZE
+
+
+def header_builder(
+    asset_type: int,
+    name: str,
+    version: int,
+    streaming_priority: int,
+    content_hash: int,
+    variant_flags: int,
+) -> bytes:
+    """Build the fixed 95-byte header common to all asset descriptors."""
+    return _HEADER_STRUCT.pack(
+        asset_type,
+        name.encode("utf-8")[:64],
+        version,
+        streaming_priority,
+        content_hash,
+        variant_flags,
+        b"",
+    )
+
+
+def header_builder_into(
+    buf: bytearray,
+    offset: int,
+    asset_type: int,
+    name: str,
+    version: int,
+    streaming_priority: int,
+    content_hash: int,
+    variant_flags: int,
+) -> None:
+    """Pack the 95-byte asset header directly into *buf* at *offset*."""
+    _HEADER_STRUCT.pack_into(
+        buf,
+        offset,
+        asset_type,
+        name.encode("utf-8")[:64],
+        version,
+        streaming_priority,
+        content_hash,
+        variant_flags,
+        b"",
+    )
+
+
+def pack_buffer_resource_descriptor(spec: Dict[str, Any], data_off: int, size: int) -> bytes:
+    return struct.pack(
+        "<QIIB15x",
+        data_off,
+        size,
+        int(spec.get("stride", 0)),
+        BUFFER_USAGE_MAP.get(spec.get("usage", "static"), 0),
+    )
+
+
+def pack_texture_resource_descriptor(spec: Dict[str, Any], data_off: int, size: int) -> bytes:
+    return struct.pack(
+        "<QIIIB19x",
+        data_off,
+        size,
+        int(spec.get("width", 0)),
+        int(spec.get("height", 0)),
+        TEXTURE_FORMAT_MAP.get(spec.get("format", "rgba8"), 1),
+    )
+
+
+def pack_audio_resource_descriptor(spec: Dict[str, Any], data_off: int, size: int) -> bytes:
+    return struct.pack(
+        "<QIIHB13x",
+        data_off,
+        size,
+        int(spec.get("sample_rate", 44_100)),
+        int(spec.get("channels", 2)),
+        AUDIO_CODEC_MAP.get(spec.get("codec", "pcm"), 0),
+    )
+
+
+_MESH_TYPE_CODES = {name: i for i, name in enumerate(sorted(VALID_MESH_TYPES), start=1)}
+
+
+_MATERIAL_BODY_STRUCT = struct.Struct("<I4fff")
+_SHADER_REF_STRUCT = struct.Struct("<I")
+_GEOMETRY_BODY_STRUCT = struct.Struct("<I3f3f")
+_LOD_STRUCT = struct.Struct("<IB")
+_SUBMESH_STRUCT = struct.Struct("<I")
+_MESH_VIEW_STRUCT = struct.Struct("<IIII")
+
+
+def pack_material_asset_descriptor_into(
+    buf,
+    asset_plan: AssetPlan,
+    entry: Dict[str, Any],
+    *,
+    base: int = 0,
+    simple: bool = False,
+) -> int:
+    """Pack one material descriptor (plus shader-reference blocks) into *buf*.
+
+    The destination span starting at *base* must be zeroed; returns the
+    number of bytes written.
+    """
+    spec = entry.get("spec") if isinstance(entry.get("spec"), dict) else {}
+    header_builder_into(
+        buf,
+        base,
+        1,
+        asset_plan.name,
+        1,
+        int(spec.get("streaming_priority", 0)),
+        asset_plan.content_hash,
+        0,
+    )
+    base_color = list(spec.get("base_color") or [1.0, 1.0, 1.0, 1.0])[:4]
+    while len(base_color) < 4:
+        base_color.append(1.0)
+    stages = int(spec.get("shader_stages", 0))
+    _MATERIAL_BODY_STRUCT.pack_into(
+        buf,
+        base + ASSET_HEADER_SIZE,
+        stages,
+        *(float(c) for c in base_color),
+        float(spec.get("metallic", 0.0)),
+        float(spec.get("roughness", 1.0)),
+    )
+    total = MATERIAL_DESC_SIZE
+    if simple:
+        return total
+    bit = 0
+    remaining = stages
+    while remaining:
+        if remaining & 1:
+            _SHADER_REF_STRUCT.pack_into(buf, base + total, 1 << bit)
+            total += SHADER_REF_SIZE
+        remaining >>= 1
+        bit += 1
+    return total
+
+
+def pack_geometry_asset_descriptor_into(
+    buf, asset_plan: AssetPlan, entry: Dict[str, Any], *, base: int = 0
+) -> int:
+    """Pack one geometry descriptor (plus LOD/submesh/mesh-view blocks) into *buf*.
+
+    The destination span starting at *base* must be zeroed; returns the
+    number of bytes written.
+    """
+    spec = entry.get("spec") if isinstance(entry.get("spec"), dict) else {}
+    lods = [l for l in (spec.get("lods") or []) if isinstance(l, dict)]
+    header_builder_into(buf, base, 2, asset_plan.name, 1, 0, asset_plan.content_hash, 0)
+    bb_min = list(spec.get("bounding_box_min") or [0.0, 0.0, 0.0])[:3]
+    bb_max = list(spec.get("bounding_box_max") or [0.0, 0.0, 0.0])[:3]
+    while len(bb_min) < 3:
+        bb_min.append(0.0)
+    while len(bb_max) < 3:
+        bb_max.append(0.0)
+    _GEOMETRY_BODY_STRUCT.pack_into(
+        buf,
+        base + ASSET_HEADER_SIZE,
+        len(lods),
+        *(float(v) for v in bb_min),
+        *(float(v) for v in bb_max),
+    )
+    total = GEOMETRY_DESC_SIZE
+    for lod in lods:
+        submeshes = [s for s in (lod.get("submeshes") or []) if isinstance(s, dict)]
+        _LOD_STRUCT.pack_into(
+            buf,
+            base + total,
+            len(submeshes),
+            _MESH_TYPE_CODES.get(lod.get("mesh_type", "standard"), 1),
+        )
+        total += MESH_DESC_SIZE
+        for sub in submeshes:
+            mesh_views = [mv for mv in (sub.get("mesh_views") or []) if isinstance(mv, dict)]
+            _SUBMESH_STRUCT.pack_into(buf, base + total, len(mesh_views))
+            total += SUBMESH_DESC_SIZE
+            for mv in mesh_views:
+                _MESH_VIEW_STRUCT.pack_into(
+                    buf,
+                    base + total,
+                    int(mv.get("first_index", 0)),
+                    int(mv.get("index_count", 0)),
+                    int(mv.get("first_vertex", 0)),
+                    int(mv.get("vertex_count", 0)),
+                )
+                total += MESH_VIEW_DESC_SIZE
+    return total
+
+
+_RESOURCE_PACKERS = {
+    "buffer": pack_buffer_resource_descriptor,
+    "texture": pack_texture_resource_descriptor,
+    "audio": pack_audio_resource_descriptor,
+}
+
+
+# Directory entry: asset key, type code, 3 pad bytes, entry offset,
+# descriptor offset, descriptor size.
+_DIR_ENTRY_STRUCT = struct.Struct("<16sB3xQQI")
+assert _DIR_ENTRY_STRUCT.size == DIRECTORY_ENTRY_SIZE
+
+
+def pack_directory_entry(
+    key: bytes, asset_type_code: int, entry_offset: int, desc_offset: int, desc_size: int
+) -> bytes:
+    return _DIR_ENTRY_STRUCT.pack(
+        key, asset_type_code, entry_offset, desc_offset, desc_size
+    )
+
+
+_FILE_HEADER_STRUCT = struct.Struct("<6sHQQ")
+_FOOTER_STRUCT = struct.Struct("<QQQQQ")
+
+# Assemble through a memory-mapping of the output file by default; the
+# flag exists so tests (and exotic platforms) can force the streaming
+# path.
+_MMAP_WRITE = True
+
+
+def _assemble_pak(build: BuildPlan, pak_plan: PakPlan, rep: Reporter, buf) -> None:
+    """Fill the pre-zeroed *buf* (bytearray or mmap) with the whole PAK.
+
+    Every offset comes straight from the plan, so padding needs no
+    explicit zero writes, and the CRC is computed in memory before the
+    buffer ever touches the disk.
+    """
+    _FILE_HEADER_STRUCT.pack_into(
+        buf, 0, PAK_MAGIC, PAK_VERSION, build.content_version, pak_plan.file_size
+    )
+
+    # Resource payloads.
+    mask = DATA_ALIGNMENT - 1
+    blob_offsets: Dict[str, List[int]] = {}
+    for region in pak_plan.regions:
+        rtype = region.name
+        blobs = build.resources.data_blobs[ResourceType[rtype.upper()]]
+        offsets: List[int] = []
+        record_offset = offsets.append
+        task_key = f"write.region.{rtype}"
+        rep.start_task(task_key, f"Write {rtype} data", total=len(blobs))
+        cursor = region.offset
+        pending = 0
+        for blob in blobs:
+            if not isinstance(blob, (bytes, bytearray, memoryview)):
+                raise PakWriteError(
+                    "resources were collected size-only; re-collect with "
+                    "payloads to write a PAK"
+                )
+            cursor += (-cursor) & mask
+            record_offset(cursor)
+            end = cursor + len(blob)
+            buf[cursor:end] = blob
+            cursor = end
+            pending += 1
+            if pending >= 64:
+                rep.advance(task_key, step=pending)
+                pending = 0
+        if pending:
+            rep.advance(task_key, step=pending)
+        if cursor != region.offset + region.size:
+            raise PakWriteError(f"{rtype} region size mismatch")
+        rep.end_task(task_key)
+        blob_offsets[rtype] = offsets
+
+    # Resource descriptor tables.
+    for table in pak_plan.tables:
+        rtype = table.name
+        if rtype == "browse_index":
+            continue
+        packer = _RESOURCE_PACKERS.get(rtype)
+        if packer is None:
+            raise PakWriteError(f"unknown resource table {rtype!r}")
+        rt = ResourceType[rtype.upper()]
+        descs = build.resources.desc_fields[rt]
+        offsets = blob_offsets[rtype]
+        blobs = build.resources.data_blobs[rt]
+        task_key = f"write.table.{rtype}"
+        rep.start_task(task_key, f"Write {rtype} table", total=len(descs))
+        pos = table.offset
+        entry_size = table.entry_size
+        for i, spec in enumerate(descs):
+            buf[pos : pos + entry_size] = packer(spec, offsets[i], len(blobs[i]))
+            pos += entry_size
+        rep.advance(task_key, step=len(descs))
+        rep.end_task(task_key)
+
+    # Asset descriptors, packed in place at their planned offsets.
+    geometry_name_to_key = build.assets.geometry_name_to_key
+    simple_material_assets = build.assets.simple_material_names
+    material_count = build.assets.material_count
+    rep.start_task("write.assets", "Write asset descriptors", total=len(pak_plan.assets))
+    pending = 0
+    for asset_plan, entry in zip(
+        pak_plan.assets[:material_count], build.assets.material_assets
+    ):
+        written = pack_material_asset_descriptor_into(
+            buf,
+            asset_plan,
+            entry,
+            base=asset_plan.descriptor_offset,
+            simple=asset_plan.name in simple_material_assets,
+        )
+        if written != asset_plan.descriptor_size + asset_plan.variable_extra_size:
+            raise PakWriteError(f"descriptor size mismatch for {asset_plan.name!r}")
+        pending += 1
+        if pending >= 64:
+            rep.advance("write.assets", step=pending, current_item=asset_plan.name)
+            pending = 0
+    for asset_plan, entry in zip(
+        pak_plan.assets[material_count:], build.assets.geometry_assets
+    ):
+        if geometry_name_to_key.get(asset_plan.name) != asset_plan.key_bytes:
+            raise PakWriteError(f"geometry key mismatch for {asset_plan.name!r}")
+        written = pack_geometry_asset_descriptor_into(
+            buf, asset_plan, entry, base=asset_plan.descriptor_offset
+        )
+        if written != asset_plan.descriptor_size + asset_plan.variable_extra_size:
+            raise PakWriteError(f"descriptor size mismatch for {asset_plan.name!r}")
+        pending += 1
+        if pending >= 64:
+            rep.advance("write.assets", step=pending, current_item=asset_plan.name)
+            pending = 0
+    if pending:
+        rep.advance("write.assets", step=pending)
+    rep.end_task("write.assets")
+
+    # Directory.  The per-entry fields are precomputed in straight-line
+    # list comprehensions so the pack loop is just index accesses.
+    directory_plan = pak_plan.directory
+    rep.start_task("write.directory", "Write directory", total=directory_plan.entry_count)
+    keys = [a.key_bytes for a in pak_plan.assets]
+    type_codes = [ASSET_TYPE_MAP.get(a.asset_type, 0) for a in pak_plan.assets]
+    desc_sizes = [
+        int(a.descriptor_size + a.variable_extra_size) for a in pak_plan.assets
+    ]
+    dir_offset = directory_plan.offset
+    pack_entry = _DIR_ENTRY_STRUCT.pack_into
+    for idx, asset_plan in enumerate(pak_plan.assets):
+        pos = dir_offset + idx * DIRECTORY_ENTRY_SIZE
+        pack_entry(
+            buf, pos, keys[idx], type_codes[idx], pos, asset_plan.descriptor_offset,
+            desc_sizes[idx],
+        )
+    rep.advance("write.directory", step=directory_plan.entry_count)
+    rep.end_task("write.directory")
+
+    # Browse index.
+    for table in pak_plan.tables:
+        if table.name == "browse_index":
+            payload = build_browse_index_payload_for_assets(pak_plan.assets)
+            if len(payload) != table.size:
+                raise PakWriteError("browse index size mismatch")
+            buf[table.offset : table.offset + table.size] = payload
+            break
+
+    # Footer, then the CRC over the buffer itself.
+    footer_offset = pak_plan.footer.offset
+    _FOOTER_STRUCT.pack_into(
+        buf,
+        footer_offset,
+        pak_plan.directory.offset,
+        pak_plan.directory.size,
+        pak_plan.directory.entry_count,
+        pak_plan.file_size,
+        build.content_version,
+    )
+    buf[footer_offset + FOOTER_SIZE - 8 : footer_offset + FOOTER_SIZE] = PAK_FOOTER_MAGIC
+    crc_field_offset = footer_offset + FOOTER_CRC_OFFSET
+    with memoryview(buf) as mv:
+        crc = zlib.crc32(mv[:crc_field_offset])
+        crc = zlib.crc32(mv[crc_field_offset + 4 :], crc)
+    struct.pack_into("<I", buf, crc_field_offset, crc & 0xFFFFFFFF)
+
+
+def _write_header(f, build: BuildPlan, pak_plan: PakPlan) -> None:
+    header = _FILE_HEADER_STRUCT.pack(
+        PAK_MAGIC, PAK_VERSION, build.content_version, pak_plan.file_size
+    )
+    f.write(header.ljust(HEADER_SIZE, b"\x00"))
+
+
+def _write_resource_regions_from_plan(
+    f, build: BuildPlan, pak_plan: PakPlan, rep: Reporter
+) -> Dict[str, List[int]]:
+    """Write all resource payloads; returns each blob's absolute offset."""
+    blob_offsets: Dict[str, List[int]] = {}
+    zero_view = memoryview(_ZERO_PAD)
+    mask = DATA_ALIGNMENT - 1
+    for region in pak_plan.regions:
+        rtype = region.name
+        blobs = build.resources.data_blobs[ResourceType[rtype.upper()]]
+        offsets: List[int] = []
+        _pad_to(f, region.offset)
+        # Bind the per-iteration lookups once: bound methods, the
+        # offsets append, and the advance key, which would otherwise be
+        # a fresh f-string per blob.
+        task_key = f"write.region.{rtype}"
+        rep.start_task(task_key, f"Write {rtype} data", total=len(blobs))
+        write = f.write
+        advance = rep.advance
+        record_offset = offsets.append
+        cursor = region.offset
+        # Batched progress: one advance per 64 blobs keeps the reporter
+        # out of the tight write loop.
+        pending = 0
+        for blob in blobs:
+            if not isinstance(blob, (bytes, bytearray, memoryview)):
+                raise PakWriteError(
+                    "resources were collected size-only; re-collect with "
+                    "payloads to write a PAK"
+                )
+            pad = (-cursor) & mask
+            if pad:
+                write(zero_view[:pad])
+                cursor += pad
+            record_offset(cursor)
+            write(blob)
+            cursor += len(blob)
+            pending += 1
+            if pending >= 64:
+                advance(task_key, step=pending)
+                pending = 0
+        if pending:
+            advance(task_key, step=pending)
+        if f.tell() != region.offset + region.size:
+            raise PakWriteError(f"{rtype} region size mismatch")
+        rep.end_task(task_key)
+        blob_offsets[rtype] = offsets
+    return blob_offsets
+
+
+def _write_resource_tables_from_plan(
+    f,
+    build: BuildPlan,
+    pak_plan: PakPlan,
+    blob_offsets: Dict[str, List[int]],
+    rep: Reporter,
+) -> None:
+    for table in pak_plan.tables:
+        rtype = table.name
+        if rtype == "browse_index":
+            continue
+        packer = _RESOURCE_PACKERS.get(rtype)
+        if packer is None:
+            raise PakWriteError(f"unknown resource table {rtype!r}")
+        rt = ResourceType[rtype.upper()]
+        descs = build.resources.desc_fields[rt]
+        offsets = blob_offsets[rtype]
+        blobs = build.resources.data_blobs[rt]
+        _pad_to(f, table.offset)
+        task_key = f"write.table.{rtype}"
+        rep.start_task(task_key, f"Write {rtype} table", total=len(descs))
+        # Dispatch resolved once per table; descriptors gather into one
+        # buffer and hit the file in a single write.
+        table_buf = bytearray()
+        for i, spec in enumerate(descs):
+            table_buf += packer(spec, offsets[i], len(blobs[i]))
+        f.write(table_buf)
+        if f.tell() != table.offset + table.size:
+            raise PakWriteError(f"{rtype} table size mismatch")
+        rep.advance(task_key, step=len(descs))
+        rep.end_task(task_key)
+
+
+def _write_assets_and_directory_from_plan(
+    f, build: BuildPlan, pak_plan: PakPlan, rep: Reporter
+) -> None:
+    # Cross-check maps are precomputed at collection time.
+    geometry_name_to_key = build.assets.geometry_name_to_key
+    simple_material_assets = build.assets.simple_material_names
+
+    material_count = build.assets.material_count
+    # One zeroed scratch buffer serves every descriptor: pack_into fills
+    # it in place and a memoryview slice is handed to write, so no
+    # per-asset bytes objects are built.
+    max_desc = max(
+        (a.descriptor_size + a.variable_extra_size for a in pak_plan.assets), default=0
+    )
+    scratch = bytearray(max_desc)
+    zeros = memoryview(bytes(max_desc))
+    scratch_view = memoryview(scratch)
+
+    pending = 0
+
+    def emit(asset_plan: AssetPlan, written: int) -> None:
+        nonlocal pending
+        expected = asset_plan.descriptor_size + asset_plan.variable_extra_size
+        if written != expected:
+            raise PakWriteError(
+                f"descriptor size mismatch for {asset_plan.name!r}: "
+                f"{written} != {expected}"
+            )
+        f.write(scratch_view[:written])
+        pending += 1
+        if pending >= 64:
+            rep.advance("write.assets", step=pending, current_item=asset_plan.name)
+            pending = 0
+
+    rep.start_task("write.assets", "Write asset descriptors", total=len(pak_plan.assets))
+    # The plan orders materials before geometries, so two contiguous
+    # sub-loops replace the per-iteration type branch and index
+    # arithmetic of a single mixed loop.
+    for asset_plan, entry in zip(
+        pak_plan.assets[:material_count], build.assets.material_assets
+    ):
+        _pad_to(f, asset_plan.descriptor_offset)
+        span = asset_plan.descriptor_size + asset_plan.variable_extra_size
+        scratch[:span] = zeros[:span]
+        emit(
+            asset_plan,
+            pack_material_asset_descriptor_into(
+                scratch, asset_plan, entry, simple=asset_plan.name in simple_material_assets
+            ),
+        )
+    for asset_plan, entry in zip(
+        pak_plan.assets[material_count:], build.assets.geometry_assets
+    ):
+        if geometry_name_to_key.get(asset_plan.name) != asset_plan.key_bytes:
+            raise PakWriteError(f"geometry key mismatch for {asset_plan.name!r}")
+        _pad_to(f, asset_plan.descriptor_offset)
+        span = asset_plan.descriptor_size + asset_plan.variable_extra_size
+        scratch[:span] = zeros[:span]
+        emit(asset_plan, pack_geometry_asset_descriptor_into(scratch, asset_plan, entry))
+    if pending:
+        rep.advance("write.assets", step=pending)
+    rep.end_task("write.assets")
+
+    directory_plan = pak_plan.directory
+    _pad_to(f, directory_plan.offset)
+    rep.start_task("write.directory", "Write directory", total=directory_plan.entry_count)
+    # Entries are fixed-size, so their positions are pure arithmetic:
+    # assemble the whole directory in one buffer and write it once,
+    # instead of a tell() and a buffered write per entry.
+    dir_buf = bytearray(directory_plan.size)
+    dir_offset = directory_plan.offset
+    keys = [a.key_bytes for a in pak_plan.assets]
+    type_codes = [ASSET_TYPE_MAP.get(a.asset_type, 0) for a in pak_plan.assets]
+    desc_sizes = [
+        int(a.descriptor_size + a.variable_extra_size) for a in pak_plan.assets
+    ]
+    pack_entry = _DIR_ENTRY_STRUCT.pack_into
+    for idx, asset_plan in enumerate(pak_plan.assets):
+        pos = idx * DIRECTORY_ENTRY_SIZE
+        pack_entry(
+            dir_buf, pos, keys[idx], type_codes[idx], dir_offset + pos,
+            asset_plan.descriptor_offset, desc_sizes[idx],
+        )
+    f.write(dir_buf)
+    rep.advance("write.directory", step=directory_plan.entry_count)
+    rep.end_task("write.directory")
+
+    browse_plan = None
+    for table in pak_plan.tables:
+        if table.name == "browse_index":
+            browse_plan = table
+            break
+    if browse_plan is not None:
+        payload = build_browse_index_payload_for_assets(pak_plan.assets)
+        _pad_to(f, browse_plan.offset)
+        if len(payload) != browse_plan.size:
+            raise PakWriteError("browse index size mismatch")
+        f.write(payload)
+
+
+def _write_footer(f, build: BuildPlan, pak_plan: PakPlan) -> None:
+    _pad_to(f, pak_plan.footer.offset)
+    footer = struct.pack(
+        "<QQQQQ",
+        pak_plan.directory.offset,
+        pak_plan.directory.size,
+        pak_plan.directory.entry_count,
+        pak_plan.file_size,
+        build.content_version,
+    )
+    footer += b"\x00" * 8  # reserved
+    footer += b"\x00" * 4  # CRC-32, patched after close
+    footer += b"\x00" * 4
+    footer += PAK_FOOTER_MAGIC
+    f.write(footer)
+
+
+def _patch_crc_streaming(f, crc_field_offset: int) -> None:
+    """Chunked-read CRC patch, for files that cannot be memory-mapped.
+
+    One reused 1 MiB bytearray is filled via readinto, so the loop
+    allocates nothing per chunk; zlib.crc32 consumes memoryview slices
+    of it directly.
+    """
+    buf = bytearray(1 << 20)
+    mv = memoryview(buf)
+    crc = 0
+    remaining = crc_field_offset
+    while remaining:
+        n = f.readinto(mv[: min(len(buf), remaining)])
+        if not n:
+            raise PakWriteError("PAK truncated before CRC field")
+        crc = zlib.crc32(mv[:n], crc)
+        remaining -= n
+    f.seek(4, 1)  # skip the CRC field itself
+    while True:
+        n = f.readinto(buf)
+        if not n:
+            break
+        crc = zlib.crc32(mv[:n], crc)
+    f.seek(crc_field_offset)
+    f.write(struct.pack("<I", crc & 0xFFFFFFFF))
+
+
+def _patch_crc(path: Path, pak_plan: PakPlan) -> None:
+    """Compute the whole-file CRC (minus the CRC field) and patch the footer.
+
+    The file is memory-mapped and fed to zlib.crc32 as two zero-copy
+    memoryview slices around the CRC field; the patch itself goes
+    through the same mapping.  Falls back to chunked reads when the
+    platform/filesystem refuses the mapping.
+    """
+    crc_field_offset = pak_plan.footer.offset + FOOTER_CRC_OFFSET
+    with path.open("r+b") as f:
+        try:
+            mm = mmap.mmap(f.fileno(), 0)
+        except (OSError, ValueError):
+            _patch_crc_streaming(f, crc_field_offset)
+            return
+        try:
+            with memoryview(mm) as mv:
+                crc = zlib.crc32(mv[:crc_field_offset])
+                crc = zlib.crc32(mv[crc_field_offset + 4 :], crc)
+                mm[crc_field_offset : crc_field_offset + 4] = struct.pack(
+                    "<I", crc & 0xFFFFFFFF
+                )
+        finally:
+            mm.close()
+
+
+def _write_pak_mmap(
+    build: BuildPlan, pak_plan: PakPlan, output_path: Path, rep: Reporter
+) -> bool:
+    """Assemble the PAK directly through a memory-mapping of the output.
+
+    The file is truncated to its exact planned size (zero-filled by the
+    kernel), mapped writable, and every section packs straight into the
+    mapping — no user-space staging buffer and no separate write pass.
+    Returns False when the platform/filesystem refuses the mapping.
+    """
+    with output_path.open("wb+") as f:
+        f.truncate(pak_plan.file_size)
+        try:
+            mm = mmap.mmap(f.fileno(), pak_plan.file_size)
+        except (OSError, ValueError):
+            return False
+        try:
+            _assemble_pak(build, pak_plan, rep, mm)
+            mm.flush()
+        finally:
+            mm.close()
+    return True
+
+
+def _write_pak_streaming(
+    build: BuildPlan, pak_plan: PakPlan, output_path: Path, rep: Reporter
+) -> None:
+    """Section-by-section write path for PAKs too large to assemble in memory."""
+    # A 1 MiB buffer coalesces the many small descriptor/directory
+    # writes into few syscalls; the default 8 KiB drains constantly.
+    with output_path.open("wb", buffering=1 << 20) as f:
+        _write_header(f, build, pak_plan)
+        blob_offsets = _write_resource_regions_from_plan(f, build, pak_plan, rep)
+        _write_resource_tables_from_plan(f, build, pak_plan, blob_offsets, rep)
+        _write_assets_and_directory_from_plan(f, build, pak_plan, rep)
+        _write_footer(f, build, pak_plan)
+        if f.tell() != pak_plan.file_size:
+            raise PakWriteError(
+                f"file size mismatch: {f.tell()} != {pak_plan.file_size}"
+            )
+    _patch_crc(output_path, pak_plan)
+
+
+def write_pak(
+    build: BuildPlan,
+    pak_plan: PakPlan,
+    output_path: Union[str, Path],
+    *,
+    rep: Optional[Reporter] = None,
+) -> None:
+    """Write the PAK described by *pak_plan* to *output_path*."""
+    rep = rep if rep is not None else get_reporter()
+    output_path = Path(output_path)
+    with section(f"Write PAK {output_path.name}", rep=rep):
+        if not _MMAP_WRITE or not _write_pak_mmap(build, pak_plan, output_path, rep):
+            _write_pak_streaming(build, pak_plan, output_path, rep)
+    rep.status(f"write summary: {pak_plan.file_size} bytes -> {output_path.name}")
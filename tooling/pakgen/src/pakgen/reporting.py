@@ -0,0 +1,512 @@
+"""Progress and status reporting.
+
+Reporters share a small task-oriented API: ``start_task`` / ``advance`` /
+``end_task`` plus free-form ``status`` / ``verbose`` / ``warning`` /
+``error`` messages and nestable ``section`` scopes.  Four implementations
+exist:
+
+* :class:`PlainReporter` — line-oriented output for dumb terminals/CI logs,
+* :class:`RichReporter` — live progress bars (requires ``rich``),
+* :class:`JsonLinesReporter` — machine-readable JSONL event stream,
+* :class:`SilentReporter` — discards everything.
+
+A module-level active reporter (see :func:`get_reporter` /
+:func:`set_reporter`) lets the pipeline stay decoupled from the CLI.
+"""
+
+from __future__ import annotations
+
+import enum
+import json
+import os
+import sys
+import time
+import weakref
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, ClassVar, Dict, Iterator, Optional, TextIO, Tuple
+
+try:
+    from rich.console import Console, Group
+    from rich.live import Live
+    from rich.progress import (
+        BarColumn,
+        Progress,
+        SpinnerColumn,
+        TaskProgressColumn,
+        TextColumn,
+        TimeElapsedColumn,
+    )
+
+    _HAVE_RICH = True
+except ImportError:  # pragma: no cover - exercised only without rich
+    _HAVE_RICH = False
+
+
+def get_verbosity() -> int:
+    """Current verbosity level, from ``PAKGEN_VERBOSITY`` (default 0)."""
+    try:
+        return int(os.environ.get("PAKGEN_VERBOSITY", "0"))
+    except ValueError:
+        return 0
+
+
+# Live reporters, so a runtime verbosity change can be pushed to all of
+# them instead of every verbose() call re-reading the environment.
+_live_reporters: "weakref.WeakSet[Reporter]" = weakref.WeakSet()
+
+
+def notify_verbosity_changed() -> None:
+    """Refresh the cached verbosity on every live reporter."""
+    for reporter in _live_reporters:
+        reporter.refresh_verbosity()
+
+
+class TaskStatus(enum.Enum):
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+@dataclass(slots=True)
+class TaskRecord:
+    """Book-keeping for one in-flight task.
+
+    ``meta`` stays None until the first metadata-carrying advance, so
+    the common no-metadata task never allocates the dict.
+    """
+
+    name: str
+    total: Optional[int] = None
+    completed: int = 0
+    status: TaskStatus = TaskStatus.RUNNING
+    start_time: float = field(default_factory=time.monotonic)
+    end_time: Optional[float] = None
+    meta: Optional[Dict[str, Any]] = None
+    # Completion count last pushed to a live renderer (RichReporter
+    # coalescing state).
+    last_pushed: int = 0
+
+    _STAT_KEYS: ClassVar[Tuple[str, ...]] = ("entries", "blobs", "bytes", "planned")
+
+    def format_stats(self) -> str:
+        """Render the well-known metadata counters as 'key=value' pairs."""
+        meta = self.meta
+        if not meta:
+            return ""
+        return " ".join(f"{k}={meta[k]}" for k in self._STAT_KEYS if k in meta)
+
+
+class Reporter:
+    """Base reporter; subclasses override the notification hooks."""
+
+    # Reporters that render nothing can opt out so section() becomes a
+    # bare yield on their fast path.
+    supports_sections: bool = True
+
+    def __init__(self) -> None:
+        self.tasks: Dict[str, TaskRecord] = {}
+        # Cached at construction; verbose() compares plain ints instead
+        # of re-reading the environment per log line.
+        self._verbosity = get_verbosity()
+        _live_reporters.add(self)
+
+    def refresh_verbosity(self) -> None:
+        """Re-read the verbosity level (see notify_verbosity_changed)."""
+        self._verbosity = get_verbosity()
+
+    # -- task lifecycle ------------------------------------------------
+
+    def start_task(self, task_id: str, name: str, total: Optional[int] = None) -> None:
+        self.tasks[task_id] = TaskRecord(name=name, total=total)
+        self._on_start(task_id, self.tasks[task_id])
+
+    def advance(self, task_id: str, step: int = 1, **meta: Any) -> None:
+        rec = self.tasks.get(task_id)
+        if rec is None:
+            return
+        rec.completed += step
+        if meta:
+            if rec.meta is None:
+                rec.meta = meta
+            else:
+                rec.meta.update(meta)
+        self._on_advance(task_id, rec, meta)
+
+    def end_task(self, task_id: str, status: TaskStatus = TaskStatus.COMPLETED) -> None:
+        rec = self.tasks.get(task_id)
+        if rec is None:
+            return
+        rec.status = status
+        rec.end_time = time.monotonic()
+        self._on_end(task_id, rec)
+
+    # -- messages ------------------------------------------------------
+
+    def status(self, message: str) -> None:
+        pass
+
+    def verbose(self, message: str, level: int = 1) -> None:
+        pass
+
+    def warning(self, message: str) -> None:
+        pass
+
+    def error(self, message: str) -> None:
+        pass
+
+    def section(self, title: str) -> None:
+        pass
+
+    def section_end(self, title: str) -> None:
+        pass
+
+    # -- hooks ---------------------------------------------------------
+
+    def _on_start(self, task_id: str, rec: TaskRecord) -> None:
+        pass
+
+    def _on_advance(self, task_id: str, rec: TaskRecord, meta: Dict[str, Any]) -> None:
+        pass
+
+    def _on_end(self, task_id: str, rec: TaskRecord) -> None:
+        pass
+
+
+class SilentReporter(Reporter):
+    """Discards all output; used in tests and as the default."""
+
+    supports_sections = False
+
+
+class PlainReporter(Reporter):
+    """Line-oriented reporter writing to an unstructured text stream.
+
+    High-frequency advance lines accumulate in an in-process buffer and
+    reach the stream in batches; task ends, warnings, errors and
+    section headers flush so interactive output stays coherent.  On an
+    unbuffered stderr this collapses a write() syscall per item into
+    one per flush.
+    """
+
+    _FLUSH_THRESHOLD = 8192
+
+    def __init__(self, stream: Optional[TextIO] = None) -> None:
+        super().__init__()
+        self.stream = stream if stream is not None else sys.stderr
+        self._pending: list = []
+        self._pending_len = 0
+
+    def _write(self, text: str) -> None:
+        self._pending.append(text)
+        self._pending_len += len(text)
+        if self._pending_len >= self._FLUSH_THRESHOLD:
+            self.flush()
+
+    def _write_parts(self, *parts: str) -> None:
+        # Queue raw fragments instead of interpolating an f-string; the
+        # join at flush time concatenates them all at once.
+        self._pending.extend(parts)
+        self._pending_len += sum(map(len, parts))
+        if self._pending_len >= self._FLUSH_THRESHOLD:
+            self.flush()
+
+    def flush(self) -> None:
+        """Drain buffered lines to the underlying stream."""
+        if self._pending:
+            self.stream.write("".join(self._pending))
+            self._pending.clear()
+            self._pending_len = 0
+
+    def _on_start(self, task_id: str, rec: TaskRecord) -> None:
+        total = str(rec.total) if rec.total is not None else "?"
+        self._write_parts(" » ", rec.name, " (0/", total, ")\n")
+
+    def _on_advance(self, task_id: str, rec: TaskRecord, meta: Dict[str, Any]) -> None:
+        item = meta.get("current_item")
+        if item is not None:
+            total = str(rec.total) if rec.total is not None else "?"
+            self._write_parts(
+                "   · ", rec.name, ": ", str(item), " (",
+                str(rec.completed), "/", total, ")\n",
+            )
+
+    def _on_end(self, task_id: str, rec: TaskRecord) -> None:
+        elapsed = (rec.end_time or time.monotonic()) - rec.start_time
+        mark = "✓" if rec.status is TaskStatus.COMPLETED else "✗"
+        line = f" {mark} {rec.name}: {rec.completed} in {elapsed:.2f}s"
+        stats = rec.format_stats()
+        if stats:
+            line += f" [{stats}]"
+        self._write(line + "\n")
+        self.flush()
+
+    def status(self, message: str) -> None:
+        # Status lines are rare (phase summaries) and often the last
+        # output of a run; flush so they cannot die in the buffer.
+        self._write(f"   {message}\n")
+        self.flush()
+
+    def verbose(self, message: str, level: int = 1) -> None:
+        if level <= self._verbosity:
+            self._write(f"   {message}\n")
+
+    def warning(self, message: str) -> None:
+        self._write(f" ! {message}\n")
+        self.flush()
+
+    def error(self, message: str) -> None:
+        self._write(f" ✗ {message}\n")
+        self.flush()
+
+    def section(self, title: str) -> None:
+        self.flush()
+        self._write(f"── {title}\n")
+        self.flush()
+
+    def section_end(self, title: str) -> None:
+        self.flush()
+
+
+class RichReporter(Reporter):
+    """Live progress display backed by ``rich.progress.Progress``."""
+
+    def __init__(self, console: Optional["Console"] = None) -> None:
+        if not _HAVE_RICH:  # pragma: no cover - exercised only without rich
+            raise RuntimeError("RichReporter requires the 'rich' package")
+        super().__init__()
+        self.console = console or Console(stderr=True)
+        self.progress: Optional[Progress] = None
+        self._detail_progress: Optional[Progress] = None
+        self._live: Optional["Live"] = None
+        self._rich_task_ids: Dict[str, int] = {}
+        self._detail_task_ids: Dict[str, Optional[int]] = {}
+        self._transient = os.environ.get("PAKGEN_PROGRESS_TRANSIENT", "") not in ("", "0")
+
+    def close(self) -> None:
+        """Stop the live display and restore the console.
+
+        Safe to call multiple times; CLIs should call this once the
+        pipeline finishes so later prints go straight to the stream.
+        """
+        if self._live is not None:
+            self._live.stop()
+            self._live = None
+            self.progress = None
+            self._detail_progress = None
+
+    def _ensure_progress(self) -> "Progress":
+        if self.progress is None:
+            # Rich's own refresh thread coalesces renders at a fixed
+            # rate; explicit refresh() calls per event would make the
+            # workload rendering-bound.  Detail rows live in their own
+            # bare-text Progress grouped under the same Live display, so
+            # neither instance filters columns per task per frame.
+            self.progress = Progress(
+                SpinnerColumn(),
+                TextColumn("[progress.description]{task.description}"),
+                BarColumn(),
+                TaskProgressColumn(),
+                TimeElapsedColumn(),
+                console=self.console,
+                refresh_per_second=4,
+            )
+            self._detail_progress = Progress(
+                TextColumn("{task.description}"), console=self.console
+            )
+            self._live = Live(
+                Group(self.progress, self._detail_progress),
+                console=self.console,
+                transient=self._transient,
+                refresh_per_second=4,
+            )
+            self._live.start()
+        return self.progress
+
+    def _on_start(self, task_id: str, rec: TaskRecord) -> None:
+        progress = self._ensure_progress()
+        rid = progress.add_task(rec.name, total=rec.total)
+        self._rich_task_ids[task_id] = rid
+        if not self._transient:
+            # Transient mode records no detail entry at all, so the
+            # advance fast path below skips every detail lookup.
+            detail_id = self._detail_progress.add_task("", total=None)
+            self._detail_task_ids[task_id] = detail_id
+
+    def _on_advance(self, task_id: str, rec: TaskRecord, meta: Dict[str, Any]) -> None:
+        if self.progress is None:
+            return
+        rid = self._rich_task_ids.get(task_id)
+        if rid is None:
+            return
+        if self._transient:
+            # No detail rows exist; push the coalesced completion and
+            # skip the current_item plumbing entirely.
+            if rec.completed - rec.last_pushed >= max(1, (rec.total or 0) // 200):
+                self.progress.update(rid, completed=rec.completed)
+                rec.last_pushed = rec.completed
+            return
+        # Coalesce: push roughly every 0.5% of the task (or whenever the
+        # displayed item changes); the refresh thread does the rest.
+        item = meta.get("current_item")
+        if item is None and rec.completed - rec.last_pushed < max(
+            1, (rec.total or 0) // 200
+        ):
+            return
+        self.progress.update(rid, completed=rec.completed)
+        rec.last_pushed = rec.completed
+        detail_id = self._detail_task_ids.get(task_id)
+        if detail_id is not None and item is not None:
+            self._detail_progress.update(detail_id, description=f"   · {item}")
+
+    def _on_end(self, task_id: str, rec: TaskRecord) -> None:
+        if self.progress is None:
+            return
+        rid = self._rich_task_ids.pop(task_id, None)
+        detail_id = self._detail_task_ids.pop(task_id, None)
+        if rid is not None:
+            self.progress.update(rid, completed=rec.completed)
+            self.progress.remove_task(rid)
+        if detail_id is not None:
+            self._detail_progress.remove_task(detail_id)
+        elapsed = (rec.end_time or time.monotonic()) - rec.start_time
+        mark = "✓" if rec.status is TaskStatus.COMPLETED else "✗"
+        line = f" {mark} {rec.name}: {rec.completed} in {elapsed:.2f}s"
+        stats = rec.format_stats()
+        if stats:
+            line += f" [{stats}]"
+        self.console.print(line, highlight=False)
+
+    def status(self, message: str) -> None:
+        self.console.print(f"   {message}", highlight=False)
+
+    def verbose(self, message: str, level: int = 1) -> None:
+        if level <= self._verbosity:
+            self.console.print(f"   {message}", highlight=False)
+
+    def warning(self, message: str) -> None:
+        self.console.print(f" ! {message}", style="yellow", highlight=False)
+
+    def error(self, message: str) -> None:
+        self.console.print(f" ✗ {message}", style="red", highlight=False)
+
+    def section(self, title: str) -> None:
+        self.console.rule(title, align="left")
+
+
+class JsonLinesReporter(Reporter):
+    """Machine-readable reporter emitting one JSON object per line."""
+
+    # Maps a lowercase status-message prefix to a structured summary event.
+    summary_map = {
+        "resources summary": "resources_summary",
+        "assets summary": "assets_summary",
+        "plan summary": "plan_summary",
+        "write summary": "write_summary",
+        "manifest summary": "manifest_summary",
+        "build summary": "build_summary",
+        "diff summary": "diff_summary",
+    }
+
+    def __init__(self, stream: Optional[TextIO] = None) -> None:
+        super().__init__()
+        self.stream = stream if stream is not None else sys.stdout
+        # One encoder for the reporter's lifetime: no per-event dispatch
+        # through json.dumps' option plumbing.
+        self._encode = json.JSONEncoder(sort_keys=True, separators=(",", ":")).encode
+        # Per-task %-templates for the extremely repetitive progress
+        # event, sidestepping dict construction and encoding entirely.
+        self._progress_tmpls: Dict[str, str] = {}
+
+    def _emit(self, obj: Dict[str, Any]) -> None:
+        self.stream.write(self._encode(obj) + "\n")
+
+    def _on_start(self, task_id: str, rec: TaskRecord) -> None:
+        self._progress_tmpls[task_id] = (
+            '{"completed":%d,"event":"task_progress","task":'
+            + self._encode(task_id)
+            + "}\n"
+        )
+        self._emit(
+            {"event": "task_start", "task": task_id, "name": rec.name, "total": rec.total}
+        )
+
+    def _on_advance(self, task_id: str, rec: TaskRecord, meta: Dict[str, Any]) -> None:
+        tmpl = self._progress_tmpls.get(task_id)
+        if tmpl is None:
+            self._emit(
+                {"event": "task_progress", "task": task_id, "completed": rec.completed}
+            )
+            return
+        self.stream.write(tmpl % rec.completed)
+
+    def _on_end(self, task_id: str, rec: TaskRecord) -> None:
+        self._progress_tmpls.pop(task_id, None)
+        self._emit(
+            {
+                "event": "task_end",
+                "task": task_id,
+                "status": rec.status.value,
+                "completed": rec.completed,
+            }
+        )
+
+    def _maybe_summary(self, message: str) -> bool:
+        # Summary lines always read "<phase> summary: ...", so the text
+        # before the colon keys the map directly — one dict probe
+        # instead of a startswith scan over every known prefix.
+        idx = message.find(":")
+        if idx < 0:
+            return False
+        event = self.summary_map.get(message[:idx].lower())
+        if event is None:
+            return False
+        self._emit({"event": event, "message": message})
+        return True
+
+    def status(self, message: str) -> None:
+        if not self._maybe_summary(message):
+            self._emit({"event": "status", "message": message})
+
+    def verbose(self, message: str, level: int = 1) -> None:
+        if level <= self._verbosity:
+            self._emit({"event": "verbose", "message": message, "level": level})
+
+    def warning(self, message: str) -> None:
+        self._emit({"event": "warning", "message": message})
+
+    def error(self, message: str) -> None:
+        self._emit({"event": "error", "message": message})
+
+    def section(self, title: str) -> None:
+        self._emit({"event": "section", "title": title})
+
+
+_active_reporter: Reporter = SilentReporter()
+
+
+def get_reporter() -> Reporter:
+    """Return the process-wide active reporter."""
+    return _active_reporter
+
+
+def set_reporter(rep: Reporter) -> Reporter:
+    """Install *rep* as the active reporter and return the previous one."""
+    global _active_reporter
+    previous = _active_reporter
+    _active_reporter = rep
+    return previous
+
+
+@contextmanager
+def section(title: str, rep: Optional[Reporter] = None) -> Iterator[None]:
+    """Scope a reporter section around a pipeline phase."""
+    reporter = rep if rep is not None else _active_reporter
+    if not reporter.supports_sections:
+        yield
+        return
+    reporter.section(title)
+    try:
+        yield
+    finally:
+        reporter.section_end(title)
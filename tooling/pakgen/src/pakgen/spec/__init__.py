@@ -0,0 +1,6 @@
+"""Spec loading, models, validation and procedural generators."""
+
+from .loader import PakSpec, load_spec
+from .validation import ValidationErrorRecord, validate
+
+__all__ = ["PakSpec", "ValidationErrorRecord", "load_spec", "validate"]
@@ -0,0 +1,406 @@
+"""Procedural scene-node generators.
+
+Scene assets may carry ``generate`` directives on template nodes; the
+loader expands those into concrete node lists before validation and
+planning ever see them.  Layouts: ``grid``, ``linear``, ``circle`` and
+``scatter``.  Expansion is deterministic: node ids are derived from the
+template name and index, and ``scatter`` uses a seeded RNG.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import math
+import random
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..errors import SpecError
+from ..packing.constants import MAX_GENERATED_NODES, VALID_LAYOUTS
+
+
+def _get_vec3_param(
+    params: Dict[str, Any], key: str, default: Tuple[float, float, float]
+) -> Tuple[float, float, float]:
+    """Read a 3-float parameter, tolerating lists/tuples of ints."""
+    val = params.get(key)
+    if val is None:
+        return default
+    # Fast path: a 3-tuple of floats is already in canonical form (the
+    # common case when params were normalized by an earlier call).
+    if type(val) is tuple and len(val) == 3 and type(val[0]) is float:
+        return val
+    if isinstance(val, (list, tuple)) and len(val) == 3:
+        return (float(val[0]), float(val[1]), float(val[2]))
+    raise SpecError(f"generate parameter {key!r} must be a 3-component vector")
+
+
+def _get_ivec3_param(
+    params: Dict[str, Any], key: str, default: Tuple[int, int, int]
+) -> Tuple[int, int, int]:
+    """Read a 3-int parameter, tolerating lists/tuples."""
+    val = params.get(key)
+    if val is None:
+        return default
+    if type(val) is tuple and len(val) == 3 and type(val[0]) is int:
+        return val
+    if isinstance(val, (list, tuple)) and len(val) == 3:
+        return (int(val[0]), int(val[1]), int(val[2]))
+    raise SpecError(f"generate parameter {key!r} must be a 3-component vector")
+
+
+# MD5 state pre-fed with "<template name>:", cloned per node.  .copy()
+# is a C-level memcpy of the hash state, far cheaper than rehashing the
+# prefix for every index.
+_UUID_PREFIX_CACHE: Dict[str, "hashlib._Hash"] = {}
+
+
+def _generate_deterministic_uuid(template_name: str, index: int) -> str:
+    """Derive a stable node id from the template name and node index."""
+    prefix = _UUID_PREFIX_CACHE.get(template_name)
+    if prefix is None:
+        prefix = hashlib.md5(
+            f"{template_name}:".encode("utf-8"), usedforsecurity=False
+        )
+        _UUID_PREFIX_CACHE[template_name] = prefix
+    h = prefix.copy()
+    h.update(str(index).encode("ascii"))
+    hx = h.hexdigest()
+    # Same 8-4-4-4-12 rendering uuid.UUID(bytes=...) would produce,
+    # without the UUID object's validation and allocation.
+    return f"{hx[:8]}-{hx[8:12]}-{hx[12:16]}-{hx[16:20]}-{hx[20:]}"
+
+
+def _make_rotation_y_quaternion(angle: float) -> List[float]:
+    """Quaternion for a rotation of *angle* radians around +Y."""
+    half = 0.5 * angle
+    return [0.0, math.sin(half), 0.0, math.cos(half)]
+
+
+# Shared immutable defaults: generated nodes never mutate rotation or
+# scale in place, so one tuple serves every node instead of two fresh
+# lists per node.
+_IDENTITY_QUAT = (0.0, 0.0, 0.0, 1.0)
+_UNIT_SCALE = (1.0, 1.0, 1.0)
+
+
+def _make_node(
+    template: Dict[str, Any],
+    index: int,
+    translation: List[float],
+    rotation: Optional[Sequence[float]] = None,
+) -> Dict[str, Any]:
+    base_name = template.get("name", "node")
+    node: Dict[str, Any] = {
+        "name": f"{base_name}_{index}",
+        "node_id": _generate_deterministic_uuid(base_name, index),
+        "translation": translation,
+        "rotation": rotation if rotation is not None else _IDENTITY_QUAT,
+        "scale": _UNIT_SCALE,
+    }
+    parent = template.get("parent")
+    if parent is not None:
+        node["parent"] = parent
+    return node
+
+
+def _soa_columns(
+    template: Dict[str, Any],
+    translations: "np.ndarray",
+    rotations: Optional["np.ndarray"] = None,
+) -> Dict[str, Any]:
+    """Assemble the columnar node layout shared by the ``*_soa`` variants.
+
+    ``rotation``/``scale`` are read-only broadcast views when uniform,
+    so a million-node expansion carries two tiny backing buffers; the
+    ``uniform_rotation`` flag tells consumers (and the AoS shim) they
+    can substitute the shared identity tuple.
+    """
+    n = len(translations)
+    base_name = template.get("name", "node")
+    uniform = rotations is None
+    if uniform:
+        rotations = np.broadcast_to(np.asarray(_IDENTITY_QUAT), (n, 4))
+    return {
+        "name": [f"{base_name}_{i}" for i in range(n)],
+        "node_id": [_generate_deterministic_uuid(base_name, i) for i in range(n)],
+        "translation": translations,
+        "rotation": rotations,
+        "scale": np.broadcast_to(np.asarray(_UNIT_SCALE), (n, 3)),
+        "parent": template.get("parent"),
+        "uniform_rotation": uniform,
+    }
+
+
+def _materialize_nodes(
+    template: Dict[str, Any], soa: Dict[str, Any]
+) -> List[Dict[str, Any]]:
+    """Thin AoS shim: one node dict per row of a columnar expansion."""
+    coords = soa["translation"].tolist()
+    if soa["uniform_rotation"]:
+        return [_make_node(template, i, coord) for i, coord in enumerate(coords)]
+    rotations = soa["rotation"].tolist()
+    return [
+        _make_node(template, i, coord, rotations[i])
+        for i, coord in enumerate(coords)
+    ]
+
+
+def _layout_count(params: Dict[str, Any], layout: str) -> int:
+    """Read and bound-check a layout's scalar ``count`` parameter."""
+    count = int(params.get("count", 1))
+    if count < 0:
+        raise SpecError(f"{layout} layout count must be non-negative: {count}")
+    if count > MAX_GENERATED_NODES:
+        raise SpecError(f"{layout} layout would generate {count} nodes")
+    return count
+
+
+def _grid_translations(params: Dict[str, Any]) -> "np.ndarray":
+    cx, cy, cz = _get_ivec3_param(params, "count", (1, 1, 1))
+    if cx < 0 or cy < 0 or cz < 0:
+        raise SpecError(f"grid layout count must be non-negative: {(cx, cy, cz)}")
+    sx, sy, sz = _get_vec3_param(params, "spacing", (1.0, 1.0, 1.0))
+    cox, coy, coz = _get_vec3_param(params, "center_offset", (0.0, 0.0, 0.0))
+    ox, oy, oz = _get_vec3_param(params, "origin", (0.0, 0.0, 0.0))
+    total = cx * cy * cz
+    if total > MAX_GENERATED_NODES:
+        raise SpecError(f"grid layout would generate {total} nodes")
+    # Broadcast the coordinate lattice in NumPy; the ij indexing and
+    # flatten order match the former ix/iy/iz nesting exactly.
+    xs = np.arange(cx) * sx + (cox + ox)
+    ys = np.arange(cy) * sy + (coy + oy)
+    zs = np.arange(cz) * sz + (coz + oz)
+    xx, yy, zz = np.meshgrid(xs, ys, zs, indexing="ij")
+    return np.stack([xx, yy, zz], axis=-1).reshape(-1, 3)
+
+
+def expand_grid_layout_soa(
+    template: Dict[str, Any], params: Dict[str, Any]
+) -> Dict[str, Any]:
+    """Columnar variant of :func:`expand_grid_layout`."""
+    return _soa_columns(template, _grid_translations(params))
+
+
+def expand_grid_layout(
+    template: Dict[str, Any], params: Dict[str, Any]
+) -> List[Dict[str, Any]]:
+    """Expand a ``grid`` directive into ``cx*cy*cz`` nodes."""
+    return _materialize_nodes(template, expand_grid_layout_soa(template, params))
+
+
+def _linear_translations(params: Dict[str, Any]) -> "np.ndarray":
+    count = _layout_count(params, "linear")
+    spacing = float(params.get("spacing", 1.0))
+    dx, dy, dz = _get_vec3_param(params, "direction", (1.0, 0.0, 0.0))
+    sx, sy, sz = _get_vec3_param(params, "start", (0.0, 0.0, 0.0))
+    d = np.arange(count) * spacing
+    return np.stack([sx + dx * d, sy + dy * d, sz + dz * d], axis=-1)
+
+
+def expand_linear_layout_soa(
+    template: Dict[str, Any], params: Dict[str, Any]
+) -> Dict[str, Any]:
+    """Columnar variant of :func:`expand_linear_layout`."""
+    return _soa_columns(template, _linear_translations(params))
+
+
+def expand_linear_layout(
+    template: Dict[str, Any], params: Dict[str, Any]
+) -> List[Dict[str, Any]]:
+    """Expand a ``linear`` directive into ``count`` nodes along a direction."""
+    return _materialize_nodes(template, expand_linear_layout_soa(template, params))
+
+
+def expand_circle_layout_soa(
+    template: Dict[str, Any], params: Dict[str, Any]
+) -> Dict[str, Any]:
+    """Columnar variant of :func:`expand_circle_layout`."""
+    count = _layout_count(params, "circle")
+    radius = float(params.get("radius", 1.0))
+    cx, cy, cz = _get_vec3_param(params, "center", (0.0, 0.0, 0.0))
+    face_center = bool(params.get("face_center", False))
+    step = (2.0 * math.pi / count) if count else 0.0
+    angles = np.arange(count) * step
+    # All trig runs vectorized in libm; no Python-level sin/cos remain.
+    translations = np.stack(
+        [
+            cx + radius * np.cos(angles),
+            np.full(count, cy),
+            cz + radius * np.sin(angles),
+        ],
+        axis=-1,
+    )
+    rotations = None
+    if face_center:
+        half = 0.5 * (-angles + math.pi / 2.0)
+        zeros = np.zeros(count)
+        rotations = np.stack([zeros, np.sin(half), zeros, np.cos(half)], axis=-1)
+    return _soa_columns(template, translations, rotations)
+
+
+def expand_circle_layout(
+    template: Dict[str, Any], params: Dict[str, Any]
+) -> List[Dict[str, Any]]:
+    """Expand a ``circle`` directive into ``count`` nodes on a Y-up circle."""
+    return _materialize_nodes(template, expand_circle_layout_soa(template, params))
+
+
+def expand_scatter_layout(
+    template: Dict[str, Any], params: Dict[str, Any]
+) -> List[Dict[str, Any]]:
+    """Expand a ``scatter`` directive into ``count`` seeded-random nodes."""
+    count = _layout_count(params, "scatter")
+    min_bound = _get_vec3_param(params, "min_bound", (0.0, 0.0, 0.0))
+    max_bound = _get_vec3_param(params, "max_bound", (1.0, 1.0, 1.0))
+    seed = int(params.get("seed", 0))
+    # The default draws the whole (count, 3) block in one vectorized
+    # call.  Both paths are seed-deterministic, but their sequences
+    # differ; specs that must reproduce positions generated by older
+    # tool versions can pin `rng: stdlib`.
+    if params.get("rng", "numpy") == "stdlib":
+        rng = random.Random(seed)
+        nodes: List[Dict[str, Any]] = []
+        for i in range(count):
+            x = rng.uniform(min_bound[0], max_bound[0])
+            y = rng.uniform(min_bound[1], max_bound[1])
+            z = rng.uniform(min_bound[2], max_bound[2])
+            nodes.append(_make_node(template, i, [x, y, z]))
+        return nodes
+    return _materialize_nodes(template, expand_scatter_layout_soa(template, params))
+
+
+def expand_scatter_layout_soa(
+    template: Dict[str, Any], params: Dict[str, Any]
+) -> Dict[str, Any]:
+    """Columnar variant of :func:`expand_scatter_layout` (numpy RNG only)."""
+    count = _layout_count(params, "scatter")
+    min_bound = _get_vec3_param(params, "min_bound", (0.0, 0.0, 0.0))
+    max_bound = _get_vec3_param(params, "max_bound", (1.0, 1.0, 1.0))
+    seed = int(params.get("seed", 0))
+    translations = np.random.default_rng(seed).uniform(
+        low=min_bound, high=max_bound, size=(count, 3)
+    )
+    return _soa_columns(template, translations)
+
+
+_LAYOUT_DISPATCH = {
+    "grid": expand_grid_layout,
+    "linear": expand_linear_layout,
+    "circle": expand_circle_layout,
+    "scatter": expand_scatter_layout,
+}
+
+
+def expand_node(node: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Expand a single template node carrying a ``generate`` directive."""
+    generate = node.get("generate")
+    if not isinstance(generate, dict):
+        raise SpecError("generate directive must be a mapping")
+    layout = generate.get("layout")
+    if layout not in VALID_LAYOUTS:
+        raise SpecError(f"unknown generate layout {layout!r}")
+    try:
+        return _LAYOUT_DISPATCH[layout](node, generate)
+    except (TypeError, ValueError) as exc:
+        raise SpecError(f"bad {layout} layout parameters: {exc}") from exc
+
+
+def _predict_count(node: Any) -> int:
+    """Upper-bound node count contributed by one template, for presizing."""
+    if not isinstance(node, dict):
+        return 1
+    generate = node.get("generate")
+    if not isinstance(generate, dict):
+        return 1
+    if generate.get("layout") == "grid":
+        try:
+            cx, cy, cz = _get_ivec3_param(generate, "count", (1, 1, 1))
+        except SpecError:
+            return 1
+        # Clamp both ways: negatives must never undershoot the
+        # preallocated lists, and anything past the global limit only
+        # needs to push the total over it — the caller raises before
+        # allocating, so the prediction must not become the allocation.
+        return min(max(cx, 0) * max(cy, 0) * max(cz, 0), MAX_GENERATED_NODES + 1)
+    try:
+        return min(max(int(generate.get("count", 1)), 0), MAX_GENERATED_NODES + 1)
+    except (TypeError, ValueError):
+        return 1
+
+
+def expand_scene_nodes(scene: Dict[str, Any], path: str = "scene") -> None:
+    """Expand all ``generate`` directives in *scene* in place.
+
+    Template nodes that carry a ``geometry`` reference also contribute one
+    renderable per generated node, appended to ``scene["renderables"]``.
+
+    Generated nodes keep the template's ``parent`` index verbatim, so a
+    template may only parent onto nodes that appear *before* it in the
+    list — those indices are stable across expansion.
+    """
+    nodes = scene.get("nodes")
+    if not isinstance(nodes, list):
+        return
+    # Hand-authored scenes rarely carry generators; a C-level any()
+    # scan lets those pass through without rebuilding the node list.
+    if not any(isinstance(n, dict) and "generate" in n for n in nodes):
+        return
+    # Final sizes are derivable from the generate directives, so both
+    # output lists are preallocated and cursor-filled; this avoids the
+    # repeated geometric regrowth appends would trigger on large
+    # expansions.
+    total = sum(_predict_count(n) for n in nodes)
+    if total > MAX_GENERATED_NODES:
+        raise SpecError(f"{path}: scene expansion exceeds MAX_GENERATED_NODES")
+    existing_renderables = list(scene.get("renderables") or [])
+    rend_total = len(existing_renderables) + sum(
+        _predict_count(n)
+        for n in nodes
+        if isinstance(n, dict)
+        and n.get("generate") is not None
+        and n.get("geometry") is not None
+    )
+    expanded_nodes: List[Any] = [None] * total
+    renderables: List[Any] = existing_renderables + [None] * (
+        rend_total - len(existing_renderables)
+    )
+    idx = 0
+    rend_idx = len(existing_renderables)
+    for node in nodes:
+        if not isinstance(node, dict) or node.get("generate") is None:
+            expanded_nodes[idx] = node
+            idx += 1
+            continue
+        try:
+            generated = expand_node(node)
+        except SpecError as exc:
+            raise SpecError(f"{path}: {exc}") from exc
+        geometry = node.get("geometry")
+        material = node.get("material")
+        # The renderable shape is fixed per template; build it once and
+        # copy per node (dict.copy is C-level) instead of re-evaluating
+        # a literal plus a material branch for every generated node.
+        base_rend: Optional[Dict[str, Any]] = None
+        if geometry is not None:
+            base_rend = {"geometry": geometry}
+            if material is not None:
+                base_rend["material_override"] = material
+        for gen_node in generated:
+            expanded_nodes[idx] = gen_node
+            if base_rend is not None:
+                rend = base_rend.copy()
+                rend["node_index"] = idx
+                renderables[rend_idx] = rend
+                rend_idx += 1
+            idx += 1
+        if idx > MAX_GENERATED_NODES:
+            raise SpecError(f"{path}: scene expansion exceeds MAX_GENERATED_NODES")
+    del expanded_nodes[idx:]
+    del renderables[rend_idx:]
+    scene["nodes"] = expanded_nodes
+    # Only rebind when expansion actually contributed renderables;
+    # otherwise the scene keeps its original list untouched.
+    if rend_idx > len(existing_renderables):
+        scene["renderables"] = renderables
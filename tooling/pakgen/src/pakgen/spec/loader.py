@@ -0,0 +1,471 @@
+"""Spec file loading.
+
+``load_spec`` reads a JSON or YAML pak spec from disk, expands any
+procedural scene-node generators, and returns a :class:`PakSpec` that
+keeps both the raw dict form (consumed by validation and planning) and
+typed resource/asset models for programmatic callers.
+"""
+
+from __future__ import annotations
+
+import concurrent.futures
+import copy
+import dataclasses
+import functools
+import io
+import json
+import logging
+import os
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+import numpy as np
+import yaml
+
+try:
+    import orjson as _orjson
+except ImportError:  # pragma: no cover - optional accelerator
+    _orjson = None
+
+try:
+    import ijson as _ijson
+except ImportError:  # pragma: no cover - optional accelerator
+    _ijson = None
+
+# JSON specs above this size stream through ijson (when installed)
+# instead of being buffered whole for orjson/json.
+_STREAM_JSON_THRESHOLD = 8 << 20
+
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:  # pragma: no cover - depends on how PyYAML was built
+    from yaml import SafeLoader as _YamlLoader
+
+    logging.getLogger(__name__).warning(
+        "PyYAML was built without libyaml; spec parsing will use the "
+        "pure-Python loader (~10x slower)"
+    )
+
+from ..errors import SpecError
+from ..packing.constants import ASSET_KEY_SIZE
+from .generators import expand_scene_nodes
+from .models import (
+    AudioResource,
+    BufferResource,
+    GeometryAsset,
+    GeometryLod,
+    MaterialAsset,
+    MeshViewTable,
+    ShaderReference,
+    Submesh,
+    TextureResource,
+)
+
+
+def uses_libyaml() -> bool:
+    """True when YAML specs parse through the C (libyaml) loader."""
+    return _YamlLoader is not yaml.SafeLoader
+
+
+def _compile_resource_parser(cls):
+    """Generate a specialized dict->model parser for a flat resource class.
+
+    Walks the dataclass fields once at import time and execs a function
+    whose body is straight-line ``field=coerce(d.get(...))`` calls —
+    partial evaluation of what a reflective field loop would do per
+    entry.  Only str/int fields participate; payload (bytes) fields are
+    loaded by the packing pipeline, not the models.
+    """
+    args = []
+    for f in dataclasses.fields(cls):
+        default = f.default if f.default is not dataclasses.MISSING else None
+        if f.type == "str":
+            args.append(f"{f.name}=str(d.get({f.name!r}, {(default or '')!r}))")
+        elif f.type == "int":
+            args.append(f"{f.name}=int(d.get({f.name!r}, {default or 0!r}))")
+    src = f"def parse(d):\n    return _cls({', '.join(args)})\n"
+    namespace = {"_cls": cls}
+    exec(src, namespace)  # noqa: S102 - import-time codegen over our own fields
+    return namespace["parse"]
+
+
+_parse_buffer_entry = _compile_resource_parser(BufferResource)
+_parse_texture_entry = _compile_resource_parser(TextureResource)
+_parse_audio_entry = _compile_resource_parser(AudioResource)
+
+
+@dataclass(slots=True)
+class PakSpec:
+    """A loaded spec: raw dict plus typed views of the resource sections.
+
+    The typed views (``buffers``, ``textures``, ``audios``,
+    ``material_assets``, ``geometry_assets``) materialize lazily on
+    first access; passes that only walk the raw dict never pay for
+    model construction.
+    """
+
+    version: int
+    content_version: int
+    base_dir: Path
+    raw: Dict[str, Any]
+    assets: List[Dict[str, Any]] = field(default_factory=list)
+    _buffers: Optional[List[BufferResource]] = None
+    _textures: Optional[List[TextureResource]] = None
+    _audios: Optional[List[AudioResource]] = None
+    _material_assets: Optional[List[MaterialAsset]] = None
+    _geometry_assets: Optional[List[GeometryAsset]] = None
+
+    @property
+    def buffers(self) -> List[BufferResource]:
+        if self._buffers is None:
+            self._buffers = [
+                _parse_buffer_entry(e)
+                for e in (self.raw.get("buffers") or [])
+                if type(e) is dict
+            ]
+        return self._buffers
+
+    @property
+    def textures(self) -> List[TextureResource]:
+        if self._textures is None:
+            self._textures = [
+                _parse_texture_entry(e)
+                for e in (self.raw.get("textures") or [])
+                if type(e) is dict
+            ]
+        return self._textures
+
+    @property
+    def audios(self) -> List[AudioResource]:
+        if self._audios is None:
+            self._audios = [
+                _parse_audio_entry(e)
+                for e in (self.raw.get("audios") or [])
+                if type(e) is dict
+            ]
+        return self._audios
+
+    @property
+    def material_assets(self) -> List[MaterialAsset]:
+        if self._material_assets is None:
+            self._material_assets = [
+                _parse_material(a) for a in self.assets if a.get("type") == "material"
+            ]
+        return self._material_assets
+
+    @property
+    def geometry_assets(self) -> List[GeometryAsset]:
+        if self._geometry_assets is None:
+            self._geometry_assets = [
+                _parse_geometry(a) for a in self.assets if a.get("type") == "geometry"
+            ]
+        return self._geometry_assets
+
+    def iter_assets(self) -> Iterator[Dict[str, Any]]:
+        """Iterate the asset entries in spec order (no copy)."""
+        return iter(self.assets)
+
+    def snapshot_assets(self) -> List[Dict[str, Any]]:
+        """Return a shallow copy of the asset list, safe to reorder."""
+        return list(self.assets)
+
+
+def load_spec(path: Union[str, Path]) -> PakSpec:
+    """Load, expand and parse the spec file at *path*.
+
+    Parses are cached per (path, mtime, size), so incremental rebuilds
+    of an unchanged spec cost one stat plus a deep copy instead of a
+    full parse and generator expansion.
+    """
+    # os primitives on the hot path: one stat answers existence, size
+    # and mtime, with no Path object construction on cache hits.
+    path_str = os.fspath(path)
+    try:
+        st = os.stat(path_str)
+    except OSError as exc:
+        raise SpecError(f"spec file not found: {path_str}") from exc
+    # Deep-copy on return so callers can mutate their spec freely
+    # without poisoning the cached instance.
+    return copy.deepcopy(_load_cached(path_str, st.st_mtime_ns, st.st_size))
+
+
+def _parse_yaml_stream(fobj, size: int) -> Any:
+    return yaml.load(fobj, Loader=_YamlLoader)
+
+
+def _parse_json_stream(fobj, size: int) -> Any:
+    if _ijson is not None and size > _STREAM_JSON_THRESHOLD:
+        # kvitems silently yields nothing for a non-object root, which
+        # would turn an array spec into an empty valid one; peek the
+        # first significant byte so non-mapping roots fail like they do
+        # on the whole-buffer paths.
+        head = fobj.read(512)
+        fobj.seek(0)
+        if head.lstrip(b" \t\r\n")[:1] != b"{":
+            raise ValueError("spec root must be a JSON object")
+        # Incremental parse: top-level sections materialize one at a
+        # time, so peak memory never holds raw bytes plus the whole
+        # parsed tree at once.
+        return {key: value for key, value in _ijson.kvitems(fobj, "")}
+    if _orjson is not None:
+        # orjson parses UTF-8 bytes directly in C — no separate decode
+        # pass and several times faster than stdlib json.
+        return _orjson.loads(fobj.read())
+    return json.load(io.TextIOWrapper(fobj, encoding="utf-8"))
+
+
+# Extension dispatch; unknown suffixes parse as JSON.  Adding a format
+# (TOML, CBOR, ...) is a one-line entry here.
+_PARSERS = {
+    ".json": _parse_json_stream,
+    ".yaml": _parse_yaml_stream,
+    ".yml": _parse_yaml_stream,
+}
+
+
+def _parse_fragment(path: Path) -> Dict[str, Any]:
+    """Parse one include fragment (worker-side of the parallel loader)."""
+    try:
+        size = path.stat().st_size
+    except OSError as exc:
+        raise SpecError(f"include fragment not found: {path}") from exc
+    parser = _PARSERS.get(path.suffix.lower(), _parse_json_stream)
+    with path.open("rb") as fobj:
+        try:
+            data = parser(fobj, size)
+        except (yaml.YAMLError, ValueError) as exc:
+            raise SpecError(f"cannot parse include fragment {path}: {exc}") from exc
+    if not isinstance(data, dict):
+        raise SpecError(f"include fragment must be a mapping: {path}")
+    return data
+
+
+def _merge_includes(data: Dict[str, Any], includes: Any, base_dir: Path) -> None:
+    """Parse and fold ``include:`` fragments into *data*.
+
+    Fragments are independent files, and the C-backed parsers release
+    the GIL for the bulk of their work, so they parse concurrently.
+    List sections (buffers/textures/audios/assets) extend the root's;
+    scalar keys fill in only where the root has none.
+    """
+    paths = [base_dir / inc for inc in includes if isinstance(inc, str)]
+    if not paths:
+        return
+    if len(paths) == 1:
+        fragments = [_parse_fragment(paths[0])]
+    else:
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=min(len(paths), os.cpu_count() or 1)
+        ) as executor:
+            fragments = list(executor.map(_parse_fragment, paths))
+    for fragment in fragments:
+        for key, val in fragment.items():
+            if isinstance(val, list):
+                existing = data.get(key)
+                if isinstance(existing, list):
+                    existing.extend(val)
+                else:
+                    data[key] = val
+            else:
+                data.setdefault(key, val)
+
+
+@functools.lru_cache(maxsize=32)
+def _load_cached(path_str: str, mtime_ns: int, size: int) -> PakSpec:
+    dot = path_str.rfind(".")
+    suffix = path_str[dot:].lower() if dot >= 0 else ""
+    # Feed the parsers the binary file handle directly: no full-file
+    # str intermediate, and the UTF-8 decode happens chunk-wise inside
+    # the parser instead of as an extra up-front pass.
+    parser = _PARSERS.get(suffix, _parse_json_stream)
+    base_dir = Path(path_str).parent
+    with open(path_str, "rb") as fobj:
+        try:
+            data = parser(fobj, size)
+        except (yaml.YAMLError, ValueError) as exc:
+            # Syntax errors are the most common real failure; surface
+            # them through the documented SpecError contract.
+            raise SpecError(f"cannot parse spec file {path_str}: {exc}") from exc
+    if not isinstance(data, dict):
+        raise SpecError(f"spec root must be a mapping: {path_str}")
+    includes = data.pop("include", None)
+    if includes:
+        # Note: the parse cache keys on the root file only; touch the
+        # root (or bump content_version) after editing a fragment.
+        _merge_includes(data, includes, base_dir)
+    _expand_generated_nodes_in_assets(data.get("assets") or [])
+    return _parse_spec_dict(data, base_dir=base_dir)
+
+
+# Error-path prefixes ("assets[i]") grown on demand and reused across
+# loads, so repeated expansion never re-formats them.
+_ASSET_PATHS: List[str] = []
+
+
+def _asset_path(i: int) -> str:
+    while len(_ASSET_PATHS) <= i:
+        _ASSET_PATHS.append(f"assets[{len(_ASSET_PATHS)}]")
+    return _ASSET_PATHS[i]
+
+
+def _expand_generated_nodes_in_assets(assets: List[Any]) -> None:
+    """Expand generator directives in every scene asset, in place.
+
+    The JSON/YAML loaders only ever emit plain dicts for object nodes,
+    so an exact-type check (a C pointer compare) replaces isinstance
+    on this per-asset hot path.
+    """
+    scene_indices = [
+        i for i, asset in enumerate(assets) if type(asset) is dict and "nodes" in asset
+    ]
+    for i in scene_indices:
+        expand_scene_nodes(assets[i], _asset_path(i))
+
+
+def _parse_submesh(data: Dict[str, Any]) -> Submesh:
+    views = MeshViewTable()
+    for mv in data.get("mesh_views") or []:
+        if isinstance(mv, dict):
+            views.append(
+                int(mv.get("first_index", 0)),
+                int(mv.get("index_count", 0)),
+                int(mv.get("first_vertex", 0)),
+                int(mv.get("vertex_count", 0)),
+            )
+    return Submesh(
+        name=str(data.get("name", "")),
+        mesh_views=views,
+        bounding_box_min=_vec3f(data.get("bounding_box_min")),
+        bounding_box_max=_vec3f(data.get("bounding_box_max")),
+    )
+
+
+def _parse_lod(data: Dict[str, Any]) -> GeometryLod:
+    return GeometryLod(
+        name=str(data.get("name", "")),
+        mesh_type=str(data.get("mesh_type", "standard")),
+        submeshes=[
+            _parse_submesh(s)
+            for s in (data.get("submeshes") or [])
+            if isinstance(s, dict)
+        ],
+        bounding_box_min=_vec3f(data.get("bounding_box_min")),
+        bounding_box_max=_vec3f(data.get("bounding_box_max")),
+        vertex_buffer=str(data.get("vertex_buffer", "")),
+        index_buffer=str(data.get("index_buffer", "")),
+    )
+
+
+# Dedup pool for asset-key bytes: specs routinely repeat keys (shared
+# material references), and pooled keys also make `is` checks valid on
+# hot comparison paths.
+_KEY_POOL: Dict[bytes, bytes] = {}
+
+
+def _intern_key(key: bytes) -> bytes:
+    return _KEY_POOL.setdefault(key, key)
+
+
+# The same separator skip set the planner and validator use, so the
+# typed models accept exactly the keys the pipeline accepts.
+_KEY_STRIP = str.maketrans("", "", "-\t\n\r ")
+
+
+def _asset_key_bytes(entry: Dict[str, Any]) -> bytes:
+    raw = entry.get("asset_key")
+    if isinstance(raw, str):
+        try:
+            key = bytes.fromhex(raw.translate(_KEY_STRIP))
+        except ValueError:
+            return b""
+        if len(key) == ASSET_KEY_SIZE:
+            return _intern_key(key)
+    return b""
+
+
+def _vec3f(val: Any) -> "np.ndarray":
+    if val is None:
+        return np.zeros(3, dtype=np.float32)
+    return np.asarray(val, dtype=np.float32)
+
+
+def _color_field(spec: Dict[str, Any], key: str) -> Optional["np.ndarray"]:
+    val = spec.get(key)
+    if isinstance(val, (list, tuple)):
+        return np.asarray(val, dtype=np.float32)
+    return None
+
+
+def _parse_material(entry: Dict[str, Any]) -> MaterialAsset:
+    spec = entry.get("spec") if isinstance(entry.get("spec"), dict) else {}
+    # Single-call construction (no post-construction setattr passes)
+    # keeps instantiation one slot-fill per field and leaves the model
+    # free to become frozen or a C-backed struct later.
+    overrides = {
+        key: val
+        for key in ("base_color", "grid_minor_color", "grid_major_color",
+                    "uv_scale", "uv_offset")
+        if (val := _color_field(spec, key)) is not None
+    }
+    return MaterialAsset(
+        name=str(entry.get("name", "")),
+        asset_key=_asset_key_bytes(entry),
+        alignment=int(entry.get("alignment", 16)),
+        material_domain=str(spec.get("material_domain", "opaque")),
+        shader_stages=int(spec.get("shader_stages", 0)),
+        shader_refs=[
+            ShaderReference(
+                stage=int(r.get("stage", 0)), shader_name=str(r.get("shader", ""))
+            )
+            for r in (spec.get("shader_refs") or [])
+            if isinstance(r, dict)
+        ],
+        metallic=float(spec.get("metallic", 0.0)),
+        roughness=float(spec.get("roughness", 1.0)),
+        base_color_texture=spec.get("base_color_texture"),
+        normal_texture=spec.get("normal_texture"),
+        orm_texture=spec.get("orm_texture"),
+        **overrides,
+    )
+
+
+def _parse_geometry(entry: Dict[str, Any]) -> GeometryAsset:
+    spec = entry.get("spec") if isinstance(entry.get("spec"), dict) else {}
+    return GeometryAsset(
+        name=str(entry.get("name", "")),
+        asset_key=_asset_key_bytes(entry),
+        alignment=int(entry.get("alignment", 16)),
+        lods=[_parse_lod(l) for l in (spec.get("lods") or []) if isinstance(l, dict)],
+        bounding_box_min=_vec3f(spec.get("bounding_box_min")),
+        bounding_box_max=_vec3f(spec.get("bounding_box_max")),
+    )
+
+
+def _parse_spec_dict(data: Dict[str, Any], base_dir: Path) -> PakSpec:
+    """Translate the raw spec dict into a :class:`PakSpec`.
+
+    Only the raw views are materialized here; the typed sections build
+    themselves on first property access.
+    """
+    assets = [a for a in (data.get("assets") or []) if type(a) is dict]
+    # Intern the type tags once: every downstream `type == "material"`
+    # comparison (collection, validation, planning) then short-circuits
+    # on pointer identity instead of comparing characters.
+    for a in assets:
+        t = a.get("type")
+        if type(t) is str:
+            a["type"] = sys.intern(t)
+        n = a.get("name")
+        if type(n) is str:
+            # Names repeat across cross-references (renderables, buffer
+            # links); interning collapses the copies.
+            a["name"] = sys.intern(n)
+    return PakSpec(
+        version=int(data.get("version", 1)),
+        content_version=int(data.get("content_version", 0)),
+        base_dir=base_dir,
+        raw=data,
+        assets=assets,
+    )
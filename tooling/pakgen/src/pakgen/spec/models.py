@@ -0,0 +1,228 @@
+"""Typed value models for spec entries.
+
+These mirror the dict shapes produced by the JSON/YAML loaders and give
+programmatic spec builders (and the editor bridge) a stable, typed
+surface.  The planning/writing pipeline itself consumes the raw dict
+form; conversion happens in :func:`pakgen.spec.loader._parse_spec_dict`.
+
+Bounding boxes and color/uv fields are fixed-size float32 ndarrays:
+~28 bytes instead of a list of boxed floats each, serializable with a
+single ``tobytes()``, and reducible across children with
+``np.minimum.reduce`` / ``np.maximum.reduce``.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Iterator, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+try:
+    from numba import njit as _njit
+except ImportError:  # pragma: no cover - optional accelerator
+    _njit = None
+
+
+def _frozen(values, n=None):
+    arr = np.array(values, dtype=np.float32) if n is None else np.full(
+        n, values, dtype=np.float32
+    )
+    arr.setflags(write=False)
+    return arr
+
+
+# Shared read-only defaults: instances that keep the default value
+# reference one module-level array instead of allocating their own.
+# Writers must replace the field (copy-on-write), not mutate in place —
+# the arrays refuse writes.
+_ZERO3 = _frozen(0.0, 3)
+_WHITE4 = _frozen(1.0, 4)
+_GRID_MINOR = _frozen([0.5, 0.5, 0.5, 1.0])
+_GRID_MAJOR = _frozen([0.8, 0.8, 0.8, 1.0])
+_UV_ONE2 = _frozen(1.0, 2)
+_UV_ZERO2 = _frozen(0.0, 2)
+
+
+@dataclass(slots=True)
+class BufferResource:
+    name: str
+    data: bytes = b""
+    stride: int = 0
+    usage: str = "static"
+
+
+@dataclass(slots=True)
+class TextureResource:
+    name: str
+    data: bytes = b""
+    width: int = 0
+    height: int = 0
+    format: str = "rgba8"
+
+
+@dataclass(slots=True)
+class AudioResource:
+    name: str
+    data: bytes = b""
+    sample_rate: int = 44_100
+    channels: int = 2
+    codec: str = "pcm"
+
+
+class ShaderReference(NamedTuple):
+    """Immutable (stage, shader) reference; compares and hashes by value."""
+
+    stage: int = 0
+    shader_name: str = ""
+
+
+class MeshView(NamedTuple):
+    """Immutable draw-range record materialized from a MeshViewTable row."""
+
+    first_index: int = 0
+    index_count: int = 0
+    first_vertex: int = 0
+    vertex_count: int = 0
+
+
+class MeshViewTable:
+    """Structure-of-arrays storage for mesh views.
+
+    All views live in one ``(n, 4)`` int32 array (columns: first_index,
+    index_count, first_vertex, vertex_count) instead of n four-field
+    objects; ``tobytes()`` hands serializers the packed little-endian
+    rows in a single copy.  Indexing materializes a :class:`MeshView`
+    record on demand.
+    """
+
+    __slots__ = ("_rows", "_count")
+
+    def __init__(self) -> None:
+        self._rows = np.empty((4, 4), dtype=np.int32)
+        self._count = 0
+
+    def append(
+        self, first_index: int, index_count: int, first_vertex: int, vertex_count: int
+    ) -> None:
+        if self._count == len(self._rows):
+            grown = np.empty((len(self._rows) * 2, 4), dtype=np.int32)
+            grown[: self._count] = self._rows
+            self._rows = grown
+        self._rows[self._count] = (first_index, index_count, first_vertex, vertex_count)
+        self._count += 1
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, index: int) -> MeshView:
+        row = self._rows[: self._count][index]
+        return MeshView(int(row[0]), int(row[1]), int(row[2]), int(row[3]))
+
+    def __iter__(self) -> Iterator[MeshView]:
+        for i in range(self._count):
+            yield self[i]
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, MeshViewTable):
+            return NotImplemented
+        return bool(np.array_equal(self.array, other.array))
+
+    @property
+    def array(self) -> "np.ndarray":
+        """Read view of the live ``(n, 4)`` rows."""
+        return self._rows[: self._count]
+
+    def tobytes(self) -> bytes:
+        return np.ascontiguousarray(self.array, dtype="<i4").tobytes()
+
+
+@dataclass(slots=True)
+class Submesh:
+    name: str = ""
+    mesh_views: MeshViewTable = field(default_factory=MeshViewTable)
+    bounding_box_min: np.ndarray = field(default_factory=lambda: _ZERO3)
+    bounding_box_max: np.ndarray = field(default_factory=lambda: _ZERO3)
+
+
+@dataclass(slots=True)
+class GeometryLod:
+    name: str = ""
+    mesh_type: str = "standard"
+    submeshes: List[Submesh] = field(default_factory=list)
+    bounding_box_min: np.ndarray = field(default_factory=lambda: _ZERO3)
+    bounding_box_max: np.ndarray = field(default_factory=lambda: _ZERO3)
+    vertex_buffer: str = ""
+    index_buffer: str = ""
+
+
+@dataclass(slots=True)
+class GeometryAsset:
+    name: str
+    asset_key: bytes = b""
+    alignment: int = 16
+    lods: List[GeometryLod] = field(default_factory=list)
+    bounding_box_min: np.ndarray = field(default_factory=lambda: _ZERO3)
+    bounding_box_max: np.ndarray = field(default_factory=lambda: _ZERO3)
+
+
+@dataclass(slots=True)
+class MaterialAsset:
+    name: str
+    asset_key: bytes = b""
+    alignment: int = 16
+    material_domain: str = "opaque"
+    shader_stages: int = 0
+    shader_refs: List[ShaderReference] = field(default_factory=list)
+    base_color: np.ndarray = field(default_factory=lambda: _WHITE4)
+    grid_minor_color: np.ndarray = field(default_factory=lambda: _GRID_MINOR)
+    grid_major_color: np.ndarray = field(default_factory=lambda: _GRID_MAJOR)
+    uv_scale: np.ndarray = field(default_factory=lambda: _UV_ONE2)
+    uv_offset: np.ndarray = field(default_factory=lambda: _UV_ZERO2)
+    metallic: float = 0.0
+    roughness: float = 1.0
+    base_color_texture: Optional[str] = None
+    normal_texture: Optional[str] = None
+    orm_texture: Optional[str] = None
+
+
+if _njit is not None:  # pragma: no cover - exercised only with numba
+
+    @_njit(cache=True)
+    def _reduce_bbox(rows):
+        mins = rows[0, :3].copy()
+        maxs = rows[0, 3:].copy()
+        for i in range(1, rows.shape[0]):
+            for c in range(3):
+                if rows[i, c] < mins[c]:
+                    mins[c] = rows[i, c]
+                if rows[i, 3 + c] > maxs[c]:
+                    maxs[c] = rows[i, 3 + c]
+        return mins, maxs
+
+else:
+
+    def _reduce_bbox(rows):
+        return rows[:, :3].min(axis=0), rows[:, 3:].max(axis=0)
+
+
+def aggregate_bounds(geometry: GeometryAsset) -> Tuple[np.ndarray, np.ndarray]:
+    """Derive geometry-level bounds from its LOD and submesh boxes.
+
+    Child boxes gather into one contiguous ``(n, 6)`` float32 block and
+    reduce in a single pass — JIT-compiled when numba is installed,
+    vectorized NumPy otherwise.  Returns the geometry's own box when it
+    has no children with boxes.
+    """
+    rows = []
+    for lod in geometry.lods:
+        rows.append((lod.bounding_box_min, lod.bounding_box_max))
+        for sub in lod.submeshes:
+            rows.append((sub.bounding_box_min, sub.bounding_box_max))
+    if not rows:
+        return geometry.bounding_box_min, geometry.bounding_box_max
+    block = np.empty((len(rows), 6), dtype=np.float32)
+    for i, (bb_min, bb_max) in enumerate(rows):
+        block[i, :3] = bb_min
+        block[i, 3:] = bb_max
+    return _reduce_bbox(block)
@@ -0,0 +1,580 @@
+"""Spec validation.
+
+Validation runs in two phases over the raw spec dict:
+
+* the *schema* phase checks structure, types, name lengths and numeric
+  ranges of every section in isolation;
+* the *semantic* phase checks cross-references (texture/buffer names,
+  geometry keys, scene parents) and payload consistency.
+
+Both phases accumulate :class:`ValidationErrorRecord` instances rather
+than raising, so callers can report every problem in one pass.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+try:
+    from numba import njit as _njit
+except ImportError:  # pragma: no cover - optional accelerator
+    _njit = None
+
+from ..packing.constants import (
+    ASSET_NAME_MAX_LENGTH,
+    ASSET_TYPE_MAP,
+    MAX_BUFFER_STRIDE,
+    MAX_INDEX_COUNT,
+    MAX_RESOURCES_PER_TYPE,
+    MAX_TEXTURE_DIMENSION,
+    MAX_VERTEX_COUNT,
+    VALID_MESH_TYPES,
+)
+
+
+class ValidationErrorRecord:
+    """A single validation failure, addressed by a dotted spec path.
+
+    Slotted: big broken specs can emit thousands of these, and the
+    slot layout costs a fraction of a dict-backed instance.
+    """
+
+    __slots__ = ("code", "message", "path")
+
+    def __init__(self, code: str, message: str, path: str) -> None:
+        self.code = code
+        self.message = message
+        self.path = path
+
+    def to_dict(self) -> Dict[str, str]:
+        return {"code": self.code, "message": self.message, "path": self.path}
+
+    def __repr__(self) -> str:  # pragma: no cover - debugging aid
+        return f"ValidationErrorRecord({self.code!r}, {self.message!r}, {self.path!r})"
+
+
+def _name_too_long(name: str, limit: int = ASSET_NAME_MAX_LENGTH) -> bool:
+    """UTF-8 byte-length check without encoding in the common cases.
+
+    The UTF-8 length is at least the codepoint count, so an over-long
+    codepoint count decides immediately; pure-ASCII names (the dominant
+    case) decide via the allocation-free isascii scan.  Only short
+    names with non-ASCII characters pay for an encode.
+    """
+    if len(name) > limit:
+        return True
+    if name.isascii():
+        return False
+    return len(name.encode("utf-8")) > limit
+
+
+def _check_name(record, name: Any, path: str) -> Optional[str]:
+    """Validate a name via the phase's bound error append."""
+    if not isinstance(name, str) or not name:
+        record(ValidationErrorRecord("E_NAME", "name must be a non-empty string", path))
+        return None
+    if _name_too_long(name):
+        record(
+            ValidationErrorRecord(
+                "E_NAME_LEN", f"name exceeds {ASSET_NAME_MAX_LENGTH} bytes", path
+            )
+        )
+    return name
+
+
+# Separators ignored inside asset keys — the exact skip set of the
+# numba scan below and of the planner's key cleaning, so all three
+# agree byte for byte on what constitutes a valid key.
+_KEY_STRIP = str.maketrans("", "", "-\t\n\r ")
+
+
+def _clean_key_hex_py(val: Any) -> Optional[str]:
+    """Normalize an asset key to 32 lowercase hex chars, or None if invalid."""
+    if not isinstance(val, str):
+        return None
+    cleaned = val.translate(_KEY_STRIP).lower()
+    if len(cleaned) != 32:
+        return None
+    try:
+        bytes.fromhex(cleaned)
+    except ValueError:
+        return None
+    return cleaned
+
+
+if _njit is not None:  # pragma: no cover - exercised only with numba
+
+    @_njit(cache=True, boundscheck=False)
+    def _scan_key_hex(raw, out):
+        """Strip separators, lowercase and hex-validate in one byte pass.
+
+        Returns the number of hex digits written to *out*, or -1 when a
+        non-hex byte is seen or the 32-digit capacity overflows.
+        """
+        n = 0
+        for i in range(raw.shape[0]):
+            b = raw[i]
+            if b == 0x2D or b == 0x20 or b == 0x09 or b == 0x0A or b == 0x0D:
+                continue  # '-', whitespace
+            if 0x41 <= b <= 0x46:  # 'A'-'F' -> lowercase
+                b += 0x20
+            if not (0x30 <= b <= 0x39 or 0x61 <= b <= 0x66):
+                return -1
+            if n == 32:
+                return -1
+            out[n] = b
+            n += 1
+        return n
+
+    def _clean_key_hex(val: Any) -> Optional[str]:
+        if not isinstance(val, str) or not val.isascii():
+            return _clean_key_hex_py(val)
+        raw = np.frombuffer(val.encode("ascii"), dtype=np.uint8)
+        out = np.empty(32, dtype=np.uint8)
+        if _scan_key_hex(raw, out) != 32:
+            return None
+        return out.tobytes().decode("ascii")
+
+else:
+    _clean_key_hex = _clean_key_hex_py
+
+
+# Declarative numeric-range constraints per resource section, compiled
+# once at import: (field, default, max inclusive, error code).  A
+# precompiled JSON-Schema validator (fastjsonschema) was evaluated for
+# this phase, but pakgen keeps its dependency set to PyYAML + numpy,
+# so the structural walk stays hand-rolled and drives this table
+# instead of inlining every constraint.
+_RESOURCE_RANGE_RULES: Dict[str, Tuple[Tuple[str, int, int, str], ...]] = {
+    "buffers": (("stride", 0, MAX_BUFFER_STRIDE, "E_BUF_STRIDE"),),
+    "textures": (
+        ("width", 0, MAX_TEXTURE_DIMENSION, "E_TEX_DIM"),
+        ("height", 0, MAX_TEXTURE_DIMENSION, "E_TEX_DIM"),
+    ),
+    "audios": (
+        ("sample_rate", 0, 0xFFFFFFFF, "E_AUDIO_RATE"),
+        ("channels", 0, 65535, "E_AUDIO_CHANNELS"),
+    ),
+}
+
+
+class _AssetPartition(NamedTuple):
+    """Assets split by type in one pass, shared by both phases."""
+
+    assets: List[Dict[str, Any]]
+    materials: List[Dict[str, Any]]
+    geometries: List[Dict[str, Any]]
+    scenes: List[Dict[str, Any]]
+
+
+def _partition_assets(spec: Dict[str, Any]) -> _AssetPartition:
+    assets: List[Dict[str, Any]] = []
+    materials: List[Dict[str, Any]] = []
+    geometries: List[Dict[str, Any]] = []
+    scenes: List[Dict[str, Any]] = []
+    for a in spec.get("assets") or []:
+        if not isinstance(a, dict):
+            continue
+        assets.append(a)
+        t = a.get("type")
+        if t == "material":
+            materials.append(a)
+        elif t == "geometry":
+            geometries.append(a)
+        elif t == "scene":
+            scenes.append(a)
+    return _AssetPartition(assets, materials, geometries, scenes)
+
+
+def _schema_phase(
+    spec: Dict[str, Any], parts: _AssetPartition
+) -> List[ValidationErrorRecord]:
+    errors: List[ValidationErrorRecord] = []
+    _record = errors.append
+    if not isinstance(spec.get("version", 1), int):
+        _record(ValidationErrorRecord("E_VERSION", "version must be an integer", "version"))
+    content_version = spec.get("content_version", 0)
+    if not isinstance(content_version, int) or not 0 <= content_version < 2**64:
+        _record(ValidationErrorRecord(
+            "E_CONTENT_VERSION", "content_version must fit an unsigned 64-bit int",
+            "content_version"))
+
+    for section in ("buffers", "textures", "audios", "assets"):
+        val = spec.get(section)
+        if val is not None and not isinstance(val, list):
+            _record(ValidationErrorRecord("E_SECTION", f"{section} must be a list", section))
+
+    for section, rules in _RESOURCE_RANGE_RULES.items():
+        entries = [e for e in (spec.get(section) or []) if isinstance(e, dict)]
+        if len(entries) > MAX_RESOURCES_PER_TYPE:
+            _record(ValidationErrorRecord("E_RES_COUNT", f"too many {section}", section))
+        for ei, entry in enumerate(entries):
+            _check_name(_record, entry.get("name"), f"{section}[{ei}].name")
+            for field, minimum, maximum, code in rules:
+                val = entry.get(field, minimum)
+                if not isinstance(val, int) or val < minimum or val > maximum:
+                    _record(ValidationErrorRecord(code, f"{field} out of range",
+                         f"{section}[{ei}].{field}"))
+
+    for i, asset in enumerate(parts.assets):
+        atype = asset.get("type")
+        if atype not in ASSET_TYPE_MAP:
+            _record(ValidationErrorRecord("E_ASSET_TYPE", f"unknown asset type {atype!r}", f"assets[{i}].type"))
+            continue
+        _check_name(_record, asset.get("name"), f"assets[{i}].name")
+
+    for mi, mat in enumerate(parts.materials):
+        mspec = mat.get("spec")
+        if mspec is not None and not isinstance(mspec, dict):
+            _record(ValidationErrorRecord("E_MAT_SPEC", "material spec must be a mapping", f"materials[{mi}].spec"))
+            continue
+        mspec = mspec or {}
+        # Bounds mirror the writer's fixed-width descriptor fields, so
+        # anything that validates clean also packs clean.
+        stages = mspec.get("shader_stages", 0)
+        if not isinstance(stages, int) or not 0 <= stages < 2**32:
+            _record(ValidationErrorRecord("E_MAT_STAGES", "shader_stages must fit an unsigned 32-bit int",
+                 f"materials[{mi}].spec.shader_stages"))
+        priority = mspec.get("streaming_priority", 0)
+        if not isinstance(priority, int) or not 0 <= priority <= 255:
+            _record(ValidationErrorRecord("E_MAT_PRIORITY", "streaming_priority must be 0..255",
+                 f"materials[{mi}].spec.streaming_priority"))
+        for scalar in ("metallic", "roughness"):
+            value = mspec.get(scalar)
+            if value is not None and not isinstance(value, (int, float)):
+                _record(ValidationErrorRecord("E_MAT_SCALAR", f"{scalar} must be a number",
+                     f"materials[{mi}].spec.{scalar}"))
+        base_color = mspec.get("base_color")
+        if base_color is not None and (
+            not isinstance(base_color, (list, tuple))
+            or any(not isinstance(c, (int, float)) for c in base_color)
+        ):
+            _record(ValidationErrorRecord("E_MAT_COLOR", "base_color must be a list of numbers",
+                 f"materials[{mi}].spec.base_color"))
+
+    for gi, geom in enumerate(parts.geometries):
+        gspec = geom.get("spec")
+        if gspec is not None and not isinstance(gspec, dict):
+            _record(ValidationErrorRecord("E_GEO_SPEC", "geometry spec must be a mapping", f"geometries[{gi}].spec"))
+            continue
+        for li, lod in enumerate((gspec or {}).get("lods") or []):
+            if not isinstance(lod, dict):
+                _record(ValidationErrorRecord("E_LOD", "lod must be a mapping", f"geometries[{gi}].lods[{li}]"))
+                continue
+            mesh_type = lod.get("mesh_type", "standard")
+            if mesh_type not in VALID_MESH_TYPES:
+                _record(ValidationErrorRecord("E_MESH_TYPE", f"unknown mesh_type {mesh_type!r}",
+                     f"geometries[{gi}].lods[{li}].mesh_type"))
+            for si, sub in enumerate(lod.get("submeshes") or []):
+                if not isinstance(sub, dict):
+                    _record(ValidationErrorRecord("E_SUBMESH", "submesh must be a mapping",
+                         f"geometries[{gi}].lods[{li}].submeshes[{si}]"))
+                    continue
+                name = sub.get("name")
+                if name is not None and _name_too_long(str(name)):
+                    _record(ValidationErrorRecord("E_NAME_LEN", f"name exceeds {ASSET_NAME_MAX_LENGTH} bytes",
+                         f"geometries[{gi}].lods[{li}].submeshes[{si}].name"))
+                for vi, mv in enumerate(sub.get("mesh_views") or []):
+                    if not isinstance(mv, dict):
+                        _record(ValidationErrorRecord("E_MESH_VIEW", "mesh_view must be a mapping",
+                             f"geometries[{gi}].lods[{li}].submeshes[{si}].mesh_views[{vi}]"))
+    return errors
+
+
+class _RefSets(NamedTuple):
+    """Name/key lookup sets used by the semantic cross-reference checks.
+
+    The source section objects ride along: a cache entry holds strong
+    references to them, which both pins their ids for the entry's
+    lifetime and lets hits be verified by identity.
+    """
+
+    texture_names: set
+    buffer_names: set
+    geometry_name_to_key: Dict[str, str]
+    known_geometry_keys: set
+    textures_obj: Any
+    buffers_obj: Any
+    assets_obj: Any
+
+
+# Keyed on the identity and length of the underlying sections.  Entries
+# keep the sections alive (see _RefSets), so a recycled id can never
+# alias a live entry; hits are additionally verified by identity before
+# use.  Revalidating the same (append-only edited) spec object reuses
+# the sets; anything else rebuilds them.
+_REF_SET_CACHE: Dict[tuple, _RefSets] = {}
+_REF_SET_CACHE_MAX = 16
+
+
+def _lookup_sets(spec: Dict[str, Any], parts: _AssetPartition) -> _RefSets:
+    textures = spec.get("textures") or ()
+    buffers = spec.get("buffers") or ()
+    assets = spec.get("assets") or ()
+    key = (
+        id(textures), len(textures),
+        id(buffers), len(buffers),
+        id(assets), len(assets),
+    )
+    cached = _REF_SET_CACHE.get(key)
+    if (
+        cached is not None
+        and cached.textures_obj is textures
+        and cached.buffers_obj is buffers
+        and cached.assets_obj is assets
+    ):
+        return cached
+    geometry_name_to_key: Dict[str, str] = {}
+    for a in parts.geometries:
+        name = a.get("name")
+        if isinstance(name, str):
+            # Keys are optional in the spec; the planner derives one
+            # from the asset identity when absent.
+            geometry_name_to_key[name] = _clean_key_hex(a.get("asset_key")) or ""
+    sets = _RefSets(
+        texture_names={t.get("name") for t in textures if isinstance(t, dict)},
+        buffer_names={b.get("name") for b in buffers if isinstance(b, dict)},
+        geometry_name_to_key=geometry_name_to_key,
+        known_geometry_keys={k for k in geometry_name_to_key.values() if k},
+        textures_obj=textures,
+        buffers_obj=buffers,
+        assets_obj=assets,
+    )
+    if len(_REF_SET_CACHE) >= _REF_SET_CACHE_MAX:
+        _REF_SET_CACHE.pop(next(iter(_REF_SET_CACHE)))
+    _REF_SET_CACHE[key] = sets
+    return sets
+
+
+# Submeshes with at least this many views run the range checks as two
+# vector comparisons instead of a per-element Python loop.
+_VECTOR_CHECK_MIN = 64
+
+
+def _int_or_sentinel(val: Any) -> int:
+    # Non-ints (and ints that would overflow the int64 scan arrays)
+    # map below every valid range so they flag as errors.
+    return val if isinstance(val, int) and -(2**63) <= val < 2**63 else -1
+
+
+# All four mesh-view fields the writer packs <IIII, with their bounds.
+_MESH_VIEW_FIELDS = (
+    ("first_index", MAX_INDEX_COUNT),
+    ("index_count", MAX_INDEX_COUNT),
+    ("first_vertex", MAX_VERTEX_COUNT),
+    ("vertex_count", MAX_VERTEX_COUNT),
+)
+
+
+def _check_mesh_view_ranges_vectorized(_record, indexed, spath: str) -> None:
+    """Range-check a large submesh's views with one C-level scan per field."""
+    n = len(indexed)
+    prefix = spath + ".mesh_views["
+    for field, maximum in _MESH_VIEW_FIELDS:
+        column = np.fromiter(
+            (_int_or_sentinel(mv.get(field, 0)) for _, mv in indexed),
+            dtype=np.int64,
+            count=n,
+        )
+        for j in np.nonzero((column < 0) | (column > maximum))[0].tolist():
+            _record(
+                ValidationErrorRecord(
+                    "E_RANGE", f"{field} out of range",
+                    f"{prefix}{indexed[j][0]}].{field}",
+                )
+            )
+
+
+def _check_scene_parents_vectorized(_record, nodes, sci: int) -> None:
+    """Bounds-check a large scene's parent indices with one vector scan.
+
+    Nodes without an integer parent get an out-of-range sentinel and a
+    cleared mask bit, so the branchy per-node conditions collapse into
+    two array comparisons; only offenders re-touch Python objects.
+    """
+    node_count = len(nodes)
+
+    def parent_of(node):
+        if not isinstance(node, dict):
+            return None
+        return node.get("parent")
+
+    raw = [parent_of(n) for n in nodes]
+    has_parent = np.fromiter((p is not None for p in raw), dtype=bool, count=node_count)
+    parents = np.fromiter(
+        (_int_or_sentinel(p) for p in raw), dtype=np.int64, count=node_count
+    )
+    bad = np.nonzero(has_parent & ((parents < 0) | (parents >= node_count)))[0]
+    for ni in bad.tolist():
+        _record(
+            ValidationErrorRecord(
+                "E_SCENE_PARENT", f"invalid parent {raw[ni]!r}",
+                f"scenes[{sci}].nodes[{ni}].parent",
+            )
+        )
+
+
+def _semantic_phase(
+    spec: Dict[str, Any], parts: _AssetPartition
+) -> List[ValidationErrorRecord]:
+    errors: List[ValidationErrorRecord] = []
+    _record = errors.append
+    assets_list = parts.assets
+
+    refs = _lookup_sets(spec, parts)
+    texture_names = refs.texture_names
+    buffer_names = refs.buffer_names
+    geometry_name_to_key = refs.geometry_name_to_key
+    known_geometry_keys = refs.known_geometry_keys
+
+    # Duplicate asset names.
+    seen_names: Dict[str, int] = {}
+    for i, a in enumerate(assets_list):
+        name = a.get("name")
+        if isinstance(name, str):
+            if name in seen_names:
+                _record(ValidationErrorRecord("E_DUP_NAME", f"duplicate asset name {name!r}", f"assets[{i}].name"))
+            else:
+                seen_names[name] = i
+
+    # Buffer payload/stride consistency for inline hex payloads.
+    buffers = [b for b in (spec.get("buffers") or []) if isinstance(b, dict)]
+    for bi, buf in enumerate(buffers):
+        data_hex = buf.get("data_hex")
+        stride = buf.get("stride", 0)
+        if isinstance(data_hex, str):
+            # Only the digit count matters here; subtracting whitespace
+            # counts avoids building stripped copies of payloads that
+            # can be megabytes of inline hex.
+            h_len = (
+                len(data_hex)
+                - data_hex.count(" ")
+                - data_hex.count("\n")
+                - data_hex.count("\t")
+                - data_hex.count("\r")
+            )
+            if h_len & 1:
+                _record(ValidationErrorRecord("E_BUF_HEX", "odd-length hex payload", f"buffers[{bi}].data_hex"))
+            elif isinstance(stride, int) and stride > 0 and (h_len >> 1) % stride:
+                _record(ValidationErrorRecord("E_BUF_STRIDE_FIT", "payload size not a multiple of stride",
+                     f"buffers[{bi}].data_hex"))
+
+    # Material texture references.
+    for mi, mat in enumerate(parts.materials):
+        mspec = mat.get("spec") if isinstance(mat.get("spec"), dict) else {}
+        for ref in ("base_color_texture", "normal_texture", "orm_texture"):
+            tex = mspec.get(ref)
+            if tex is not None and tex not in texture_names:
+                _record(ValidationErrorRecord("E_TEX_REF", f"unknown texture {tex!r}",
+                     f"materials[{mi}].spec.{ref}"))
+
+    # Geometry buffer references and mesh-view ranges.  Error paths
+    # build incrementally per nesting level: sibling errors share the
+    # already-formatted prefix and only the innermost index goes
+    # through %-substitution per error.
+    for gi, geom in enumerate(parts.geometries):
+        gspec = geom.get("spec") if isinstance(geom.get("spec"), dict) else {}
+        gpath = "geometries[%d]" % gi
+        for li, lod in enumerate(gspec.get("lods") or []):
+            if not isinstance(lod, dict):
+                continue
+            lpath = gpath + ".lods[%d]" % li
+            for ref in ("vertex_buffer", "index_buffer"):
+                buf = lod.get(ref)
+                if buf and buf not in buffer_names:
+                    _record(ValidationErrorRecord("E_BUF_REF", f"unknown buffer {buf!r}",
+                         lpath + "." + ref))
+            for si, sub in enumerate(lod.get("submeshes") or []):
+                if not isinstance(sub, dict):
+                    continue
+                spath = lpath + ".submeshes[%d]" % si
+                indexed = [
+                    (vi, mv)
+                    for vi, mv in enumerate(sub.get("mesh_views") or [])
+                    if isinstance(mv, dict)
+                ]
+                if len(indexed) >= _VECTOR_CHECK_MIN:
+                    _check_mesh_view_ranges_vectorized(_record, indexed, spath)
+                    continue
+                for vi, mv in indexed:
+                    for field, maximum in _MESH_VIEW_FIELDS:
+                        value = mv.get(field, 0)
+                        if not isinstance(value, int) or value < 0 or value > maximum:
+                            _record(ValidationErrorRecord(
+                                "E_RANGE", f"{field} out of range",
+                                spath + ".mesh_views[%d]." % vi + field))
+
+    # Scene node graphs and renderable references.
+    for sci, scene in enumerate(parts.scenes):
+        nodes = scene.get("nodes")
+        if not isinstance(nodes, list):
+            continue
+        node_count = len(nodes)
+        if node_count >= _VECTOR_CHECK_MIN:
+            _check_scene_parents_vectorized(_record, nodes, sci)
+        else:
+            for ni, node in enumerate(nodes):
+                if not isinstance(node, dict):
+                    continue
+                parent = node.get("parent")
+                if parent is None:
+                    continue
+                if not isinstance(parent, int) or parent < 0 or parent >= node_count:
+                    _record(ValidationErrorRecord("E_SCENE_PARENT", f"invalid parent {parent!r}",
+                         f"scenes[{sci}].nodes[{ni}].parent"))
+        for ri, rend in enumerate(scene.get("renderables") or []):
+            if not isinstance(rend, dict):
+                continue
+            geo = rend.get("geometry")
+            if not isinstance(geo, str):
+                continue
+            key = _clean_key_hex(geo)
+            if key is not None:
+                if key not in known_geometry_keys:
+                    _record(ValidationErrorRecord("E_GEO_KEY", "renderable references unknown geometry key",
+                         f"scenes[{sci}].renderables[{ri}].geometry"))
+            elif geo not in geometry_name_to_key:
+                _record(ValidationErrorRecord("E_GEO_REF", f"unknown geometry {geo!r}",
+                     f"scenes[{sci}].renderables[{ri}].geometry"))
+
+    # Leftover generator directives mean expansion did not run.  An
+    # explicit double-break loop: only the first hit matters and no
+    # generator frames get allocated per asset/node.
+    has_generate = False
+    for asset in assets_list:
+        for node in asset.get("nodes") or ():
+            if isinstance(node, dict) and node.get("generate") is not None:
+                has_generate = True
+                break
+        if has_generate:
+            break
+    if has_generate:
+        _record(ValidationErrorRecord("E_UNEXPANDED", "spec contains unexpanded generate directives", "assets"))
+    return errors
+
+
+def build_validator():
+    """Compile the two-phase validator into a single closure.
+
+    The phases (and the append-heavy plumbing inside them) bind once
+    here instead of being re-resolved as module globals per call —
+    "precompile once, validate many".  The phase split itself survives
+    only for the error-code taxonomy.
+    """
+    schema_phase = _schema_phase
+    semantic_phase = _semantic_phase
+    partition = _partition_assets
+
+    def validate(spec: Dict[str, Any]) -> List[ValidationErrorRecord]:
+        """Run both validation phases and return all accumulated errors."""
+        parts = partition(spec)
+        errors = schema_phase(spec, parts)
+        errors.extend(semantic_phase(spec, parts))
+        return errors
+
+    return validate
+
+
+validate = build_validator()
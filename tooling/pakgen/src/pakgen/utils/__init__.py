@@ -0,0 +1 @@
+"""Small shared helpers."""
@@ -0,0 +1,84 @@
+"""Shared fixtures: a representative spec covering every section."""
+
+from __future__ import annotations
+
+import copy
+from typing import Any, Dict
+
+import pytest
+
+SAMPLE_SPEC: Dict[str, Any] = {
+    "version": 1,
+    "content_version": 7,
+    "buffers": [
+        {"name": "cube.vb", "stride": 12, "usage": "vertex", "data_hex": "00" * 36},
+        {"name": "cube.ib", "stride": 4, "usage": "index", "data_hex": "01" * 24},
+    ],
+    "textures": [
+        {
+            "name": "grid.albedo",
+            "width": 4,
+            "height": 4,
+            "format": "rgba8",
+            "data_hex": "ff" * 64,
+        },
+    ],
+    "audios": [
+        {"name": "click", "sample_rate": 22050, "channels": 1, "data_hex": "0a" * 16},
+    ],
+    "assets": [
+        {
+            "type": "material",
+            "name": "mat.grid",
+            "asset_key": "00112233-4455-6677-8899-aabbccddeeff",
+            "spec": {
+                "shader_stages": 0b101,
+                "base_color": [0.5, 0.5, 0.5, 1.0],
+                "base_color_texture": "grid.albedo",
+            },
+        },
+        {
+            "type": "geometry",
+            "name": "geo.cube",
+            "asset_key": "ffeeddcc-bbaa-9988-7766-554433221100",
+            "alignment": 32,
+            "spec": {
+                "bounding_box_min": [-1.0, -1.0, -1.0],
+                "bounding_box_max": [1.0, 1.0, 1.0],
+                "lods": [
+                    {
+                        "mesh_type": "standard",
+                        "vertex_buffer": "cube.vb",
+                        "index_buffer": "cube.ib",
+                        "submeshes": [
+                            {
+                                "name": "main",
+                                "mesh_views": [
+                                    {
+                                        "first_index": 0,
+                                        "index_count": 6,
+                                        "first_vertex": 0,
+                                        "vertex_count": 3,
+                                    }
+                                ],
+                            }
+                        ],
+                    }
+                ],
+            },
+        },
+        {
+            "type": "scene",
+            "name": "scene.main",
+            "nodes": [
+                {"name": "root"},
+                {"name": "child", "parent": 0},
+            ],
+        },
+    ],
+}
+
+
+@pytest.fixture
+def sample_spec() -> Dict[str, Any]:
+    return copy.deepcopy(SAMPLE_SPEC)
@@ -0,0 +1,130 @@
+"""Tests for procedural scene-node generators."""
+
+import math
+
+import pytest
+
+from pakgen.errors import SpecError
+from pakgen.spec.generators import (
+    expand_circle_layout,
+    expand_grid_layout,
+    expand_linear_layout,
+    expand_scatter_layout,
+    expand_scene_nodes,
+)
+
+
+def test_grid_layout_counts_and_positions():
+    template = {"name": "tile"}
+    nodes = expand_grid_layout(
+        template, {"count": [2, 1, 3], "spacing": [1.0, 1.0, 2.0]}
+    )
+    assert len(nodes) == 6
+    assert nodes[0]["translation"] == [0.0, 0.0, 0.0]
+    assert nodes[-1]["translation"] == [1.0, 0.0, 4.0]
+    assert nodes[0]["name"] == "tile_0"
+    assert all(n["rotation"] == (0.0, 0.0, 0.0, 1.0) for n in nodes)
+
+
+def test_grid_layout_rejects_bad_count():
+    with pytest.raises(SpecError):
+        expand_grid_layout({"name": "t"}, {"count": [1, 2]})
+
+
+def test_linear_layout_direction():
+    nodes = expand_linear_layout(
+        {"name": "post"}, {"count": 3, "spacing": 2.0, "direction": [0.0, 0.0, 1.0]}
+    )
+    assert [n["translation"][2] for n in nodes] == [0.0, 2.0, 4.0]
+
+
+def test_circle_layout_radius_and_facing():
+    nodes = expand_circle_layout(
+        {"name": "seat"}, {"count": 4, "radius": 2.0, "face_center": True}
+    )
+    assert len(nodes) == 4
+    for node in nodes:
+        x, y, z = node["translation"]
+        assert math.isclose(math.hypot(x, z), 2.0, abs_tol=1e-9)
+    # Node 0 sits at angle 0 and must face the center (rotated around Y).
+    assert tuple(nodes[0]["rotation"]) != (0.0, 0.0, 0.0, 1.0)
+
+
+def test_scatter_layout_is_seed_deterministic():
+    params = {"count": 5, "seed": 42, "min_bound": [0, 0, 0], "max_bound": [1, 1, 1]}
+    a = expand_scatter_layout({"name": "rock"}, params)
+    b = expand_scatter_layout({"name": "rock"}, params)
+    assert [n["translation"] for n in a] == [n["translation"] for n in b]
+    assert all(0.0 <= c <= 1.0 for n in a for c in n["translation"])
+
+
+def test_node_ids_are_deterministic():
+    a = expand_linear_layout({"name": "x"}, {"count": 2})
+    b = expand_linear_layout({"name": "x"}, {"count": 2})
+    assert [n["node_id"] for n in a] == [n["node_id"] for n in b]
+    assert a[0]["node_id"] != a[1]["node_id"]
+
+
+def test_expand_scene_nodes_generates_renderables():
+    scene = {
+        "nodes": [
+            {"name": "static"},
+            {
+                "name": "tree",
+                "geometry": "geo.tree",
+                "material": "mat.bark",
+                "generate": {"layout": "linear", "count": 3},
+            },
+        ]
+    }
+    expand_scene_nodes(scene)
+    assert len(scene["nodes"]) == 4
+    rends = scene["renderables"]
+    assert len(rends) == 3
+    assert rends[0] == {
+        "geometry": "geo.tree",
+        "material_override": "mat.bark",
+        "node_index": 1,
+    }
+
+
+def test_expand_scene_nodes_passthrough_without_generators():
+    scene = {"nodes": [{"name": "a"}, {"name": "b", "parent": 0}]}
+    expand_scene_nodes(scene)
+    assert scene["nodes"] == [{"name": "a"}, {"name": "b", "parent": 0}]
+    assert "renderables" not in scene
+
+
+def test_expand_scene_nodes_rejects_unknown_layout():
+    scene = {"nodes": [{"name": "bad", "generate": {"layout": "spiral"}}]}
+    with pytest.raises(SpecError):
+        expand_scene_nodes(scene)
+
+
+def test_negative_counts_raise_spec_error():
+    with pytest.raises(SpecError):
+        expand_linear_layout({"name": "t"}, {"count": -5})
+    with pytest.raises(SpecError):
+        expand_grid_layout({"name": "t"}, {"count": [2, -1, 3]})
+    scene = {
+        "nodes": [
+            {"name": "bad", "generate": {"layout": "linear", "count": -5}},
+        ]
+    }
+    with pytest.raises(SpecError):
+        expand_scene_nodes(scene)
+
+
+def test_oversized_expansion_raises_before_allocating():
+    # A billion-node grid must surface as SpecError from the size
+    # check, never as a MemoryError from the preallocation.
+    scene = {
+        "nodes": [
+            {
+                "name": "huge",
+                "generate": {"layout": "grid", "count": [1000, 1000, 1000]},
+            }
+        ]
+    }
+    with pytest.raises(SpecError):
+        expand_scene_nodes(scene)
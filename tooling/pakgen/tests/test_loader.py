@@ -0,0 +1,136 @@
+"""Tests for spec loading and parsing."""
+
+import json
+
+import pytest
+import yaml
+
+from pakgen.errors import SpecError
+from pakgen.spec.loader import load_spec
+
+
+def test_load_json_spec(tmp_path, sample_spec):
+    path = tmp_path / "spec.json"
+    path.write_text(json.dumps(sample_spec), encoding="utf-8")
+    spec = load_spec(path)
+    assert spec.content_version == 7
+    assert [b.name for b in spec.buffers] == ["cube.vb", "cube.ib"]
+    assert [t.name for t in spec.textures] == ["grid.albedo"]
+    assert [a.name for a in spec.audios] == ["click"]
+    assert len(spec.material_assets) == 1
+    assert spec.material_assets[0].shader_stages == 0b101
+    assert len(spec.geometry_assets) == 1
+    assert spec.geometry_assets[0].lods[0].submeshes[0].mesh_views[0].index_count == 6
+    assert spec.base_dir == tmp_path
+
+
+def test_load_yaml_spec(tmp_path, sample_spec):
+    path = tmp_path / "spec.yaml"
+    path.write_text(yaml.safe_dump(sample_spec), encoding="utf-8")
+    spec = load_spec(path)
+    assert len(spec.assets) == 3
+    assert spec.material_assets[0].name == "mat.grid"
+
+
+def test_load_spec_expands_generators(tmp_path):
+    data = {
+        "assets": [
+            {
+                "type": "scene",
+                "name": "scene.gen",
+                "nodes": [
+                    {
+                        "name": "tile",
+                        "geometry": "geo.tile",
+                        "generate": {"layout": "grid", "count": [2, 2, 1]},
+                    }
+                ],
+            }
+        ]
+    }
+    path = tmp_path / "spec.json"
+    path.write_text(json.dumps(data), encoding="utf-8")
+    spec = load_spec(path)
+    scene = spec.assets[0]
+    assert len(scene["nodes"]) == 4
+    assert len(scene["renderables"]) == 4
+
+
+def test_load_spec_missing_file(tmp_path):
+    with pytest.raises(SpecError):
+        load_spec(tmp_path / "nope.json")
+
+
+def test_load_spec_non_mapping_root(tmp_path):
+    path = tmp_path / "spec.json"
+    path.write_text("[1, 2, 3]", encoding="utf-8")
+    with pytest.raises(SpecError):
+        load_spec(path)
+
+
+def test_iter_assets_returns_spec_order(tmp_path, sample_spec):
+    path = tmp_path / "spec.json"
+    path.write_text(json.dumps(sample_spec), encoding="utf-8")
+    spec = load_spec(path)
+    assets = spec.iter_assets()
+    assert [a["type"] for a in assets] == ["material", "geometry", "scene"]
+
+
+def test_load_spec_caches_until_file_changes(tmp_path, sample_spec):
+    path = tmp_path / "spec.json"
+    path.write_text(json.dumps(sample_spec), encoding="utf-8")
+    a = load_spec(path)
+    b = load_spec(path)
+    assert a is not b  # deep copies, safe to mutate
+    assert a.raw == b.raw
+    # Changing the file invalidates the cached parse.
+    sample_spec["content_version"] = 99
+    path.write_text(json.dumps(sample_spec), encoding="utf-8")
+    import os
+
+    os.utime(path, ns=(path.stat().st_atime_ns, path.stat().st_mtime_ns + 1))
+    assert load_spec(path).content_version == 99
+
+
+def test_include_fragments_merge(tmp_path, sample_spec):
+    buffers = sample_spec.pop("buffers")
+    textures = sample_spec.pop("textures")
+    (tmp_path / "buffers.json").write_text(json.dumps({"buffers": buffers}))
+    (tmp_path / "textures.json").write_text(json.dumps({"textures": textures}))
+    sample_spec["include"] = ["buffers.json", "textures.json"]
+    path = tmp_path / "root.json"
+    path.write_text(json.dumps(sample_spec), encoding="utf-8")
+    spec = load_spec(path)
+    assert [b.name for b in spec.buffers] == ["cube.vb", "cube.ib"]
+    assert [t.name for t in spec.textures] == ["grid.albedo"]
+    assert "include" not in spec.raw
+
+
+def test_parse_errors_surface_as_spec_error(tmp_path):
+    bad_yaml = tmp_path / "bad.yaml"
+    bad_yaml.write_text("assets: [unclosed", encoding="utf-8")
+    with pytest.raises(SpecError):
+        load_spec(bad_yaml)
+    bad_json = tmp_path / "bad.json"
+    bad_json.write_text('{"assets": [', encoding="utf-8")
+    with pytest.raises(SpecError):
+        load_spec(bad_json)
+    root = tmp_path / "root.json"
+    root.write_text(json.dumps({"include": ["frag.json"]}), encoding="utf-8")
+    (tmp_path / "frag.json").write_text("[1,", encoding="utf-8")
+    with pytest.raises(SpecError):
+        load_spec(root)
+
+
+def test_typed_model_keys_match_pipeline_normalization(tmp_path, sample_spec):
+    # Interior separators are accepted (as the planner/validator do)...
+    sample_spec["assets"][0]["asset_key"] = "00112233 4455-6677 8899-aabb ccddeeff"
+    # ...and wrong-length keys fall back to empty instead of leaking.
+    sample_spec["assets"][1]["asset_key"] = "ffeeddccbbaa"
+    path = tmp_path / "spec.json"
+    path.write_text(json.dumps(sample_spec), encoding="utf-8")
+    spec = load_spec(path)
+    assert spec.material_assets[0].asset_key == bytes.fromhex(
+        "00112233445566778899aabbccddeeff"
+    )
+    assert spec.geometry_assets[0].asset_key == b""
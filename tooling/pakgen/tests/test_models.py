@@ -0,0 +1,50 @@
+"""Tests for the typed spec models."""
+
+import numpy as np
+
+from pakgen.spec.models import (
+    GeometryAsset,
+    GeometryLod,
+    MeshViewTable,
+    Submesh,
+    aggregate_bounds,
+)
+
+
+def test_mesh_view_table_roundtrip():
+    table = MeshViewTable()
+    for i in range(10):
+        table.append(i, i * 2, i * 3, i * 4)
+    assert len(table) == 10
+    assert table[3].index_count == 6
+    assert [mv.first_index for mv in table] == list(range(10))
+    assert table.tobytes() == table.array.astype("<i4").tobytes()
+
+
+def test_aggregate_bounds_over_children():
+    geo = GeometryAsset(
+        name="g",
+        lods=[
+            GeometryLod(
+                bounding_box_min=np.array([-1, -2, 0], dtype=np.float32),
+                bounding_box_max=np.array([1, 2, 0], dtype=np.float32),
+                submeshes=[
+                    Submesh(
+                        mesh_views=MeshViewTable(),
+                        bounding_box_min=np.array([-3, 0, 0], dtype=np.float32),
+                        bounding_box_max=np.array([0, 5, 1], dtype=np.float32),
+                    )
+                ],
+            )
+        ],
+    )
+    mins, maxs = aggregate_bounds(geo)
+    assert mins.tolist() == [-3.0, -2.0, 0.0]
+    assert maxs.tolist() == [1.0, 5.0, 1.0]
+
+
+def test_aggregate_bounds_without_children():
+    geo = GeometryAsset(name="empty")
+    mins, maxs = aggregate_bounds(geo)
+    assert mins.tolist() == [0.0, 0.0, 0.0]
+    assert maxs.tolist() == [0.0, 0.0, 0.0]
@@ -0,0 +1,149 @@
+"""Tests for layout planning."""
+
+import pytest
+
+from pakgen.errors import PlanError
+from pakgen.packing.constants import (
+    DATA_ALIGNMENT,
+    DIRECTORY_ENTRY_SIZE,
+    FOOTER_SIZE,
+    GEOMETRY_DESC_SIZE,
+    HEADER_SIZE,
+    MATERIAL_DESC_SIZE,
+    MESH_DESC_SIZE,
+    MESH_VIEW_DESC_SIZE,
+    SHADER_REF_SIZE,
+    SUBMESH_DESC_SIZE,
+    TABLE_ALIGNMENT,
+    ResourceType,
+)
+from pakgen.packing.planner import SizedBlob, build_plan, compute_pak_plan, to_plan_dict
+
+
+@pytest.fixture
+def plan_and_build(tmp_path, sample_spec):
+    build = build_plan(sample_spec, tmp_path)
+    return compute_pak_plan(build), build
+
+
+def test_collect_resources(tmp_path, sample_spec):
+    build = build_plan(sample_spec, tmp_path)
+    assert len(build.resources.data_blobs[ResourceType.BUFFER]) == 2
+    assert len(build.resources.data_blobs[ResourceType.TEXTURE]) == 1
+    assert len(build.resources.data_blobs[ResourceType.AUDIO]) == 1
+    assert build.resources.total_bytes == 36 + 24 + 64 + 16
+    assert build.resources.index_map[ResourceType.BUFFER]["cube.vb"] == 0
+    by_name = build.resources.by_name
+    assert by_name["buffer"][2]["cube.ib"] == 1
+
+
+def test_collect_resources_rejects_duplicates(tmp_path, sample_spec):
+    sample_spec["buffers"].append({"name": "cube.vb", "data_hex": "00"})
+    with pytest.raises(PlanError):
+        build_plan(sample_spec, tmp_path)
+
+
+def test_collect_assets_partition(tmp_path, sample_spec):
+    build = build_plan(sample_spec, tmp_path)
+    assert build.assets.material_count == 1
+    assert build.assets.geometry_count == 1
+    assert build.assets.scene_count == 1
+    mat = build.assets.material_assets[0]
+    assert mat["key_hex"] == "00112233445566778899aabbccddeeff"
+    assert mat["spec"]["name"] == "mat.grid"
+
+
+def test_plan_section_alignment(plan_and_build):
+    plan, _ = plan_and_build
+    for region in plan.regions:
+        assert region.offset % DATA_ALIGNMENT == 0
+    for table in plan.tables:
+        assert table.offset % TABLE_ALIGNMENT == 0
+    for asset in plan.assets:
+        assert asset.descriptor_offset % asset.alignment == 0
+    assert plan.file_size == plan.footer.offset + FOOTER_SIZE
+
+
+def test_plan_asset_sizes(plan_and_build):
+    plan, _ = plan_and_build
+    material = plan.assets[0]
+    assert material.asset_type == "material"
+    assert material.descriptor_size == MATERIAL_DESC_SIZE
+    # shader_stages 0b101 -> two shader references.
+    assert material.variable_extra_size == 2 * SHADER_REF_SIZE
+    geometry = plan.assets[1]
+    assert geometry.asset_type == "geometry"
+    assert geometry.descriptor_size == GEOMETRY_DESC_SIZE
+    assert geometry.variable_extra_size == (
+        MESH_DESC_SIZE + SUBMESH_DESC_SIZE + MESH_VIEW_DESC_SIZE
+    )
+    assert geometry.alignment == 32
+
+
+def test_plan_directory(plan_and_build):
+    plan, _ = plan_and_build
+    assert plan.directory.entry_count == 2
+    assert plan.directory.size == 2 * DIRECTORY_ENTRY_SIZE
+    assert plan.directory.offset >= HEADER_SIZE
+
+
+def test_plan_is_deterministic_under_input_order(tmp_path, sample_spec):
+    plan_a = compute_pak_plan(build_plan(sample_spec, tmp_path))
+    sample_spec["assets"].reverse()
+    sample_spec["buffers"].reverse()
+    plan_b = compute_pak_plan(build_plan(sample_spec, tmp_path))
+    assert to_plan_dict(plan_a) == to_plan_dict(plan_b)
+
+
+def test_to_plan_dict_statistics(plan_and_build):
+    plan, _ = plan_and_build
+    stats = to_plan_dict(plan)["statistics"]
+    assert stats["asset_counts"] == {"material": 1, "geometry": 1}
+    assert stats["variable_extra_total"] == (
+        2 * SHADER_REF_SIZE + MESH_DESC_SIZE + SUBMESH_DESC_SIZE + MESH_VIEW_DESC_SIZE
+    )
+    assert stats["padding_total"] == plan.padding.total
+
+
+def test_size_only_build_plans_identically(tmp_path, sample_spec):
+    import copy
+
+    full = compute_pak_plan(build_plan(copy.deepcopy(sample_spec), tmp_path))
+    lean_build = build_plan(sample_spec, tmp_path, size_only=True)
+    assert all(
+        isinstance(b, SizedBlob) and len(b) == b.size
+        for blobs in lean_build.resources.data_blobs
+        for b in blobs
+    )
+    lean = compute_pak_plan(lean_build)
+    assert to_plan_dict(lean) == to_plan_dict(full)
+
+
+def test_unreadable_resource_collects_empty_blob(tmp_path, sample_spec):
+    sample_spec["textures"][0] = {"name": "grid.albedo", "file": "missing.bin"}
+    build = build_plan(sample_spec, tmp_path)
+    assert build.resources.data_blobs[ResourceType.TEXTURE] == [b""]
+
+
+def test_repeated_planning_reuses_cached_plan(tmp_path, sample_spec):
+    build = build_plan(sample_spec, tmp_path)
+    plan_a = compute_pak_plan(build)
+    plan_b = compute_pak_plan(build)
+    assert plan_b is plan_a
+    # A layout-relevant change must miss the cache.
+    build.assets.material_assets[0]["spec"]["shader_stages"] = 0b1111
+    plan_c = compute_pak_plan(build)
+    assert plan_c is not plan_a
+
+
+def test_size_only_plan_agrees_on_corrupt_hex(tmp_path, sample_spec):
+    import copy
+
+    sample_spec["buffers"][0]["data_hex"] = "abc"  # odd length, invalid
+    full = build_plan(copy.deepcopy(sample_spec), tmp_path)
+    lean = build_plan(sample_spec, tmp_path, size_only=True)
+    # Both collection modes treat the corrupt payload as empty...
+    assert full.resources.by_name["buffer"][0][0] == b""
+    assert len(lean.resources.by_name["buffer"][0][0]) == 0
+    # ...and therefore plan identical layouts.
+    assert to_plan_dict(compute_pak_plan(lean)) == to_plan_dict(compute_pak_plan(full))
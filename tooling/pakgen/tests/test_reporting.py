@@ -0,0 +1,87 @@
+"""Tests for the reporting layer."""
+
+import io
+import json
+
+from pakgen.reporting import (
+    JsonLinesReporter,
+    PlainReporter,
+    SilentReporter,
+    TaskStatus,
+    get_reporter,
+    section,
+    set_reporter,
+)
+
+
+def test_task_lifecycle_bookkeeping():
+    rep = SilentReporter()
+    rep.start_task("t", "Task", total=10)
+    rep.advance("t", step=3)
+    rep.advance("t", current_item="x")
+    rep.end_task("t")
+    rec = rep.tasks["t"]
+    assert rec.completed == 4
+    assert rec.status is TaskStatus.COMPLETED
+    assert rec.meta["current_item"] == "x"
+    assert rec.end_time is not None
+
+
+def test_advance_unknown_task_is_ignored():
+    rep = SilentReporter()
+    rep.advance("nope")  # must not raise
+    assert rep.tasks == {}
+
+
+def test_plain_reporter_output():
+    stream = io.StringIO()
+    rep = PlainReporter(stream)
+    rep.start_task("t", "Copy blobs", total=2)
+    rep.advance("t", current_item="a.bin")
+    rep.advance("t", bytes=128)
+    rep.end_task("t")
+    out = stream.getvalue()
+    assert "Copy blobs" in out
+    assert "a.bin" in out
+    assert "bytes=128" in out
+
+
+def test_jsonl_reporter_events():
+    stream = io.StringIO()
+    rep = JsonLinesReporter(stream)
+    rep.start_task("t", "Task", total=1)
+    rep.advance("t")
+    rep.end_task("t")
+    rep.status("hello")
+    events = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert [e["event"] for e in events] == [
+        "task_start",
+        "task_progress",
+        "task_end",
+        "status",
+    ]
+    assert events[2]["status"] == "completed"
+
+
+def test_jsonl_reporter_summary_mapping():
+    stream = io.StringIO()
+    rep = JsonLinesReporter(stream)
+    rep.status("plan summary: 2 assets")
+    rep.status("Resources Summary: 4 blobs")
+    events = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert events[0]["event"] == "plan_summary"
+    assert events[1]["event"] == "resources_summary"
+
+
+def test_active_reporter_and_section():
+    stream = io.StringIO()
+    rep = JsonLinesReporter(stream)
+    previous = set_reporter(rep)
+    try:
+        assert get_reporter() is rep
+        with section("Phase 1"):
+            pass
+        events = [json.loads(line) for line in stream.getvalue().splitlines()]
+        assert {"event": "section", "title": "Phase 1"} in events
+    finally:
+        set_reporter(previous)
@@ -0,0 +1,207 @@
+"""Tests for spec validation."""
+
+from pakgen.packing.constants import ASSET_NAME_MAX_LENGTH
+from pakgen.spec.validation import validate
+
+
+def codes(errors):
+    return [e.code for e in errors]
+
+
+def test_sample_spec_is_valid(sample_spec):
+    assert validate(sample_spec) == []
+
+
+def test_texture_dimension_out_of_range(sample_spec):
+    sample_spec["textures"][0]["width"] = 1 << 20
+    assert "E_TEX_DIM" in codes(validate(sample_spec))
+
+
+def test_name_too_long(sample_spec):
+    sample_spec["assets"][0]["name"] = "x" * (ASSET_NAME_MAX_LENGTH + 1)
+    assert "E_NAME_LEN" in codes(validate(sample_spec))
+
+
+def test_utf8_name_length_counts_bytes(sample_spec):
+    # 32 two-byte codepoints: 32 chars but 64 UTF-8 bytes.
+    sample_spec["assets"][0]["name"] = "é" * 32
+    assert "E_NAME_LEN" in codes(validate(sample_spec))
+
+
+def test_unknown_asset_type(sample_spec):
+    sample_spec["assets"].append({"type": "shader", "name": "bad"})
+    assert "E_ASSET_TYPE" in codes(validate(sample_spec))
+
+
+def test_duplicate_asset_names(sample_spec):
+    sample_spec["assets"].append(
+        {"type": "material", "name": "mat.grid", "spec": {}}
+    )
+    assert "E_DUP_NAME" in codes(validate(sample_spec))
+
+
+def test_unknown_texture_reference(sample_spec):
+    sample_spec["assets"][0]["spec"]["base_color_texture"] = "missing.tex"
+    assert "E_TEX_REF" in codes(validate(sample_spec))
+
+
+def test_unknown_buffer_reference(sample_spec):
+    sample_spec["assets"][1]["spec"]["lods"][0]["vertex_buffer"] = "missing.vb"
+    assert "E_BUF_REF" in codes(validate(sample_spec))
+
+
+def test_buffer_hex_stride_mismatch(sample_spec):
+    sample_spec["buffers"][0]["data_hex"] = "00" * 35  # not a multiple of stride 12
+    assert "E_BUF_STRIDE_FIT" in codes(validate(sample_spec))
+
+
+def test_odd_hex_payload(sample_spec):
+    sample_spec["buffers"][0]["data_hex"] = "abc"
+    assert "E_BUF_HEX" in codes(validate(sample_spec))
+
+
+def test_mesh_view_range(sample_spec):
+    views = sample_spec["assets"][1]["spec"]["lods"][0]["submeshes"][0]["mesh_views"]
+    views[0]["index_count"] = -1
+    errors = validate(sample_spec)
+    assert "E_RANGE" in codes(errors)
+    record = next(e for e in errors if e.code == "E_RANGE")
+    assert record.path.endswith("mesh_views[0].index_count")
+
+
+def test_scene_parent_out_of_bounds(sample_spec):
+    sample_spec["assets"][2]["nodes"][1]["parent"] = 99
+    assert "E_SCENE_PARENT" in codes(validate(sample_spec))
+
+
+def test_unexpanded_generate_directive(sample_spec):
+    sample_spec["assets"][2]["nodes"].append(
+        {"name": "gen", "generate": {"layout": "linear", "count": 2}}
+    )
+    assert "E_UNEXPANDED" in codes(validate(sample_spec))
+
+
+def test_error_record_to_dict(sample_spec):
+    sample_spec["textures"][0]["width"] = -1
+    record = validate(sample_spec)[0]
+    as_dict = record.to_dict()
+    assert set(as_dict) == {"code", "message", "path"}
+    assert as_dict["code"] == record.code
+
+
+def test_mesh_view_range_vectorized_path(sample_spec):
+    views = [
+        {"first_index": 0, "index_count": 1, "first_vertex": 0, "vertex_count": 1}
+        for _ in range(100)
+    ]
+    views[7]["index_count"] = -5
+    views[93]["vertex_count"] = "not-an-int"
+    sample_spec["assets"][1]["spec"]["lods"][0]["submeshes"][0]["mesh_views"] = views
+    errors = [e for e in validate(sample_spec) if e.code == "E_RANGE"]
+    assert {e.path.rsplit(".", 1)[0].rsplit("[", 1)[1].rstrip("]") for e in errors} == {
+        "7",
+        "93",
+    }
+
+
+def test_scene_parent_vectorized_path(sample_spec):
+    nodes = [{"name": f"n{i}", "parent": 0} for i in range(80)]
+    nodes[0] = {"name": "root"}
+    nodes[13]["parent"] = 999
+    nodes[55]["parent"] = "root"
+    sample_spec["assets"][2]["nodes"] = nodes
+    errors = [e for e in validate(sample_spec) if e.code == "E_SCENE_PARENT"]
+    assert sorted(e.path for e in errors) == [
+        "scenes[0].nodes[13].parent",
+        "scenes[0].nodes[55].parent",
+    ]
+
+
+def test_vectorized_paths_flag_out_of_int64_values(sample_spec):
+    views = [
+        {"first_index": 0, "index_count": 1, "first_vertex": 0, "vertex_count": 1}
+        for _ in range(70)
+    ]
+    views[3]["index_count"] = 2**70
+    sample_spec["assets"][1]["spec"]["lods"][0]["submeshes"][0]["mesh_views"] = views
+    nodes = [{"name": f"n{i}", "parent": 0} for i in range(70)]
+    nodes[0] = {"name": "root"}
+    nodes[9]["parent"] = 2**70
+    sample_spec["assets"][2]["nodes"] = nodes
+    codes = {e.code for e in validate(sample_spec)}
+    assert "E_RANGE" in codes
+    assert "E_SCENE_PARENT" in codes
+
+
+def test_lookup_sets_never_serve_stale_entries_across_specs(sample_spec):
+    # Sweep many freshly built specs; recycled list ids must never hit
+    # another spec's cached reference sets (gh review: false E_TEX_REF).
+    import copy
+    import json
+
+    for i in range(200):
+        spec = json.loads(json.dumps(sample_spec))
+        spec["textures"][0]["name"] = f"tex{i}"
+        spec["assets"][0]["spec"]["base_color_texture"] = f"tex{i}"
+        assert validate(spec) == [], f"iteration {i}"
+        del spec
+
+    # And repeated validation of the same object still reuses the sets.
+    same = copy.deepcopy(sample_spec)
+    assert validate(same) == []
+    assert validate(same) == []
+
+
+def test_clean_key_hex_separator_semantics():
+    from pakgen.spec.validation import _clean_key_hex
+
+    # Interior separators and whitespace are skipped, case folds.
+    assert (
+        _clean_key_hex("00112233 44556677-8899AABB\tCCDDEEFF")
+        == "00112233445566778899aabbccddeeff"
+    )
+    # \v is not in the skip set and must reject, not be stripped.
+    assert _clean_key_hex("00112233445566778899aabbccddeeff\x0b") is None
+    assert _clean_key_hex("00112233445566778899aabbccddee") is None  # 30 digits
+    assert _clean_key_hex(1234) is None
+
+
+def test_writer_width_fields_are_bounded(sample_spec):
+    sample_spec["content_version"] = -1
+    mspec = sample_spec["assets"][0]["spec"]
+    mspec["shader_stages"] = 1 << 40
+    mspec["streaming_priority"] = 300
+    mspec["metallic"] = "high"
+    mspec["base_color"] = [1.0, "red", 0.0, 1.0]
+    codes = {e.code for e in validate(sample_spec)}
+    assert {
+        "E_CONTENT_VERSION",
+        "E_MAT_STAGES",
+        "E_MAT_PRIORITY",
+        "E_MAT_SCALAR",
+        "E_MAT_COLOR",
+    } <= codes
+
+
+def test_mesh_view_offsets_are_range_checked(sample_spec):
+    views = sample_spec["assets"][1]["spec"]["lods"][0]["submeshes"][0]["mesh_views"]
+    views[0]["first_index"] = -1
+    views.append({"first_index": 0, "index_count": 1, "first_vertex": 1 << 40,
+                  "vertex_count": 1})
+    errors = [e for e in validate(sample_spec) if e.code == "E_RANGE"]
+    assert {e.path.rsplit(".", 1)[1] for e in errors} == {"first_index", "first_vertex"}
+    # Vectorized path flags the same fields.
+    big = [dict(first_index=0, index_count=1, first_vertex=0, vertex_count=1)
+           for _ in range(80)]
+    big[5]["first_index"] = -1
+    big[70]["first_vertex"] = 1 << 40
+    sample_spec["assets"][1]["spec"]["lods"][0]["submeshes"][0]["mesh_views"] = big
+    errors = [e for e in validate(sample_spec) if e.code == "E_RANGE"]
+    assert {e.path.rsplit(".", 1)[1] for e in errors} == {"first_index", "first_vertex"}
+
+
+def test_audio_fields_are_range_checked(sample_spec):
+    sample_spec["audios"][0]["sample_rate"] = 1 << 35
+    sample_spec["audios"][0]["channels"] = 70000
+    codes = {e.code for e in validate(sample_spec)}
+    assert {"E_AUDIO_RATE", "E_AUDIO_CHANNELS"} <= codes
@@ -0,0 +1,147 @@
+"""Tests for PAK writing: round-trip the planned layout from disk."""
+
+import struct
+import zlib
+
+import pytest
+
+from pakgen.packing.constants import (
+    DIRECTORY_ENTRY_SIZE,
+    FOOTER_CRC_OFFSET,
+    FOOTER_SIZE,
+    PAK_FOOTER_MAGIC,
+    PAK_MAGIC,
+)
+from pakgen.packing.planner import build_plan, compute_pak_plan
+from pakgen.packing.writer import write_pak
+
+
+@pytest.fixture
+def written_pak(tmp_path, sample_spec):
+    build = build_plan(sample_spec, tmp_path)
+    plan = compute_pak_plan(build)
+    out = tmp_path / "out.pak"
+    write_pak(build, plan, out)
+    return out, plan, build
+
+
+def test_file_size_and_magics(written_pak):
+    out, plan, _ = written_pak
+    data = out.read_bytes()
+    assert len(data) == plan.file_size
+    assert data.startswith(PAK_MAGIC)
+    assert data.endswith(PAK_FOOTER_MAGIC)
+
+
+def test_footer_fields(written_pak):
+    out, plan, build = written_pak
+    data = out.read_bytes()
+    footer = data[plan.footer.offset :]
+    dir_off, dir_size, entry_count, file_size, content_version = struct.unpack_from(
+        "<QQQQQ", footer
+    )
+    assert dir_off == plan.directory.offset
+    assert dir_size == plan.directory.size
+    assert entry_count == plan.directory.entry_count
+    assert file_size == plan.file_size
+    assert content_version == build.content_version
+
+
+def test_crc_patched_and_valid(written_pak):
+    out, plan, _ = written_pak
+    data = out.read_bytes()
+    crc_off = plan.footer.offset + FOOTER_CRC_OFFSET
+    (stored,) = struct.unpack_from("<I", data, crc_off)
+    expected = zlib.crc32(data[:crc_off] + data[crc_off + 4 :]) & 0xFFFFFFFF
+    assert stored == expected
+    assert stored != 0
+
+
+def test_directory_entries_point_at_descriptors(written_pak):
+    out, plan, _ = written_pak
+    data = out.read_bytes()
+    for i, asset in enumerate(plan.assets):
+        entry_off = plan.directory.offset + i * DIRECTORY_ENTRY_SIZE
+        key, type_code, entry_pos, desc_off, desc_size = struct.unpack_from(
+            "<16sB3xQQI", data, entry_off
+        )
+        assert key == bytes.fromhex(asset.key_hex)
+        assert entry_pos == entry_off
+        assert desc_off == asset.descriptor_offset
+        assert desc_size == asset.descriptor_size + asset.variable_extra_size
+        # Descriptor starts with the asset name in its 95-byte header.
+        name_field = data[desc_off + 1 : desc_off + 65]
+        assert name_field.rstrip(b"\x00").decode("utf-8") == asset.name
+
+
+def test_resource_blobs_written_at_planned_offsets(written_pak):
+    out, plan, build = written_pak
+    data = out.read_bytes()
+    for region in plan.regions:
+        blobs = build.resources.by_name[region.name][0]
+        if blobs:
+            assert data[region.offset : region.offset + len(blobs[0])] == blobs[0]
+
+
+def test_browse_index_lists_all_assets(written_pak):
+    out, plan, _ = written_pak
+    data = out.read_bytes()
+    browse = next(t for t in plan.tables if t.name == "browse_index")
+    (count,) = struct.unpack_from("<I", data, browse.offset)
+    assert count == len(plan.assets)
+    cursor = browse.offset + 4
+    paths = []
+    for _ in range(count):
+        key, plen = struct.unpack_from("<16sH", data, cursor)
+        cursor += 18
+        paths.append(data[cursor : cursor + plen].decode("utf-8"))
+        cursor += plen
+    assert "assets/mat/grid" in paths
+    assert cursor == browse.offset + browse.size
+
+
+def test_write_is_byte_deterministic(tmp_path, sample_spec):
+    import copy
+
+    outs = []
+    for i in range(2):
+        spec = copy.deepcopy(sample_spec)
+        build = build_plan(spec, tmp_path)
+        plan = compute_pak_plan(build)
+        out = tmp_path / f"out{i}.pak"
+        write_pak(build, plan, out)
+        outs.append(out.read_bytes())
+    assert outs[0] == outs[1]
+
+
+def test_streaming_path_matches_mmap_path(tmp_path, sample_spec, monkeypatch):
+    import copy
+
+    from pakgen.packing import writer as writer_mod
+
+    build = build_plan(copy.deepcopy(sample_spec), tmp_path)
+    plan = compute_pak_plan(build)
+    mapped = tmp_path / "mapped.pak"
+    write_pak(build, plan, mapped)
+
+    monkeypatch.setattr(writer_mod, "_MMAP_WRITE", False)
+    build2 = build_plan(copy.deepcopy(sample_spec), tmp_path)
+    plan2 = compute_pak_plan(build2)
+    streamed = tmp_path / "streamed.pak"
+    write_pak(build2, plan2, streamed)
+
+    assert streamed.read_bytes() == mapped.read_bytes()
+
+
+def test_file_backed_blobs_write_zero_copy(tmp_path, sample_spec):
+    payload = bytes(range(200))
+    (tmp_path / "tex.bin").write_bytes(payload)
+    sample_spec["textures"][0] = {"name": "grid.albedo", "width": 4, "height": 4,
+                                  "file": "tex.bin"}
+    build = build_plan(sample_spec, tmp_path)
+    blob = build.resources.by_name["texture"][0][0]
+    assert isinstance(blob, memoryview)
+    plan = compute_pak_plan(build)
+    out = tmp_path / "mapped_blob.pak"
+    write_pak(build, plan, out)
+    assert payload in out.read_bytes()